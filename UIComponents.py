@@ -1,65 +1,440 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+import csv
 from decimal import Decimal
+from functools import lru_cache, wraps
+from itertools import accumulate
 import json
+import multiprocessing
+import os
+import struct
+from time import perf_counter
+from types import MappingProxyType
 from typing import Optional, Union, Callable, Type
 
 import pygame
 
 
-class UIObject():
+def _to_display_format(surface:pygame.Surface) -> Optional[pygame.Surface]:
+    """
+    Returns copy of a surface in the display format, which is the fastest to blit, or None if there is no display yet
+    """
+    if pygame.display.get_surface() is None:
+        return None
+
+    if surface.get_flags() & pygame.SRCALPHA:
+        return surface.convert_alpha()
+
+    return surface.convert()
+
+class FontRegistry():
+    """
+    Process-wide cache of pygame fonts keyed by family, size, bold and italic, evicting the least recently used font when full
+    """
+    def __init__(self, max_fonts:int=64):
+        self.max_fonts = max_fonts
+        self.hits = 0
+        self.misses = 0
+
+        self._fonts = OrderedDict()
+
+    def get(self, font:str, size:int, bold:bool=False, italic:bool=False) -> pygame.font.Font:
+        """
+        Returns a font for given parameters, creating it only if it isn't cached yet
+        """
+        key = (font, size, bold, italic)
+
+        try:
+            f = self._fonts[key]
+        except KeyError:
+            self.misses += 1
+
+            f = pygame.font.SysFont(font, size, bold, italic)
+            self._fonts[key] = f
+
+            # Drop least recently used fonts
+            while len(self._fonts) > self.max_fonts:
+                self._fonts.popitem(last=False)
+
+            return f
+
+        self.hits += 1
+        self._fonts.move_to_end(key)
+
+        return f
+
+    def clear(self):
+        """
+        Removes all cached fonts and resets counters
+        """
+        self._fonts.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._fonts)
+
+# Shared by all UI components
+font_registry = FontRegistry()
+
+class TextCache():
+    """
+    Process-wide cache of rendered text surfaces limited by the total amount of pixel bytes, evicting the least recently used surface when full.
+    Returned surfaces are shared between components and must not be modified
+    """
+    def __init__(self, max_bytes:int=8 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+        self._surfaces = OrderedDict()
+        self._used_bytes = 0
+
+    @property
+    def used_bytes(self) -> int:
+        return self._used_bytes
+
+    def render(self, font:str, size:int, text:str, color:tuple, antialias:bool=True, bold:bool=False, italic:bool=False) -> pygame.Surface:
+        """
+        Returns rendered text surface, rendering it only if it isn't cached yet
+        """
+        key = (font, size, bold, italic, text, bool(antialias), tuple(color))
+
+        try:
+            surface = self._surfaces[key]
+        except KeyError:
+            self.misses += 1
+
+            surface = font_registry.get(font, size, bold, italic).render(text, antialias, color)
+            # Surfaces in display format are the fastest to blit
+            surface = _to_display_format(surface) or surface
+            self._store(key, surface)
+
+            return surface
+
+        self.hits += 1
+        self._surfaces.move_to_end(key)
+
+        return surface
+
+    def prerender(self, requests:list, processes:Optional[int]=None, chunk_size:int=256) -> int:
+        """
+        Renders many texts at once in a pool of processes and puts them in the cache, useful at startup. Every request is a tuple
+        (font, size, text, color) optionally followed by antialias, bold and italic, like arguments of 'render'.
+        Returns how many texts have been rendered
+        """
+        pending = {}
+        for request in requests:
+            font, size, text, color, antialias, bold, italic = (*request, True, False, False)[:7]
+            key = (font, size, bold, italic, text, bool(antialias), tuple(color))
+
+            if key not in self._surfaces:
+                pending[key] = (font, size, text, color, antialias, bold, italic)
+
+        # Texts without antialiasing have a color key instead of alpha, render them here
+        remote = [request for request in pending.values() if request[4]]
+        local = [request for request in pending.values() if not request[4]]
+
+        # Starting processes isn't worth it for a few texts or a single core
+        if (processes or os.cpu_count() or 1) == 1 or len(remote) <= chunk_size:
+            local += remote
+            remote = []
+
+        for font, size, text, color, antialias, bold, italic in local:
+            surface = font_registry.get(font, size, bold, italic).render(text, antialias, color)
+            self._store((font, size, bold, italic, text, bool(antialias), tuple(color)), _to_display_format(surface) or surface)
+
+        if remote:
+            chunks = [remote[i:i + chunk_size] for i in range(0, len(remote), chunk_size)]
+
+            with ProcessPoolExecutor(processes) as pool:
+                for chunk, rendered in zip(chunks, pool.map(_rasterize_texts, chunks)):
+                    for (font, size, text, color, antialias, bold, italic), (surface_size, pixels) in zip(chunk, rendered):
+                        surface = pygame.image.frombytes(pixels, surface_size, 'RGBA')
+                        self._store((font, size, bold, italic, text, bool(antialias), tuple(color)), _to_display_format(surface) or surface)
+
+        return len(pending)
+
+    def put(self, surface:pygame.Surface, font:str, size:int, text:str, color:tuple, antialias:bool=True, bold:bool=False, italic:bool=False):
+        """
+        Puts already rendered text in the cache, ex. loaded from a snapshot, so 'render' with the same arguments returns it
+        """
+        self._store((font, size, bold, italic, text, bool(antialias), tuple(color)), _to_display_format(surface) or surface)
+
+    def _store(self, key:tuple, surface:pygame.Surface):
+        """
+        Adds a surface to the cache and drops least recently used surfaces until it fits the budget
+        """
+        # Replacing a surface frees its bytes first
+        old = self._surfaces.pop(key, None)
+        if old is not None:
+            self._used_bytes -= old.get_width() * old.get_height() * old.get_bytesize()
+
+        surface_bytes = surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+        # Don't let a single huge surface flush the whole cache
+        if surface_bytes > self.max_bytes:
+            return
+
+        self._surfaces[key] = surface
+        self._used_bytes += surface_bytes
+
+        while self._used_bytes > self.max_bytes:
+            _, old = self._surfaces.popitem(last=False)
+            self._used_bytes -= old.get_width() * old.get_height() * old.get_bytesize()
+
+    def clear(self):
+        """
+        Removes all cached surfaces and resets counters
+        """
+        self._surfaces.clear()
+        self._used_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._surfaces)
+
+# Shared by all UI components
+text_cache = TextCache()
+
+def _rasterize_texts(requests:list) -> list:
+    """
+    Renders texts in a worker process of 'TextCache.prerender', returns their sizes and RGBA pixels
+    """
+    if not pygame.font.get_init():
+        pygame.font.init()
+
+    rendered = []
+    for font, size, text, color, antialias, bold, italic in requests:
+        surface = font_registry.get(font, size, bold, italic).render(text, antialias, color)
+        rendered.append((surface.get_size(), pygame.image.tobytes(surface, 'RGBA')))
+
+    return rendered
+
+def text_requests(*objects:Type['CompactUIObject']) -> list:
+    """
+    Returns requests for 'text_cache.prerender' of texts that given objects, their sub objects and labels will render
+    """
+    requests = []
+
+    for root in objects:
+        for obj in UIManager._walk(root):
+            for part in (obj, *obj._batched_parts()):
+                request = part._text_request()
+
+                if request is not None:
+                    requests.append(request)
+
+    return requests
+
+# (font, text, width, height) -> biggest font size that fits, loaded from layout snapshots
+_fitted_font_sizes = {}
+
+@lru_cache(maxsize=1024)
+def _fit_font_size(font:str, text:str, max_width:int, max_height:int) -> Optional[int]:
+    """
+    Finds the biggest font size for which text fits inside given width and height, returns None if even the smallest font doesn't fit
+    """
+    def fits(size:int) -> bool:
+        width, height = font_registry.get(font, size).size(text)
+        return width <= max_width and height <= max_height
+
+    # Font sizes smaller than 2 are never used
+    low = 2
+    high = int(min(max_width, max_height))
+
+    if high < low or not fits(low):
+        return None
+
+    # Text size grows with font size so bisect for the last size that still fits
+    while low < high:
+        middle = (low + high + 1) // 2
+
+        if fits(middle):
+            low = middle
+        else:
+            high = middle - 1
+
+    return low
+
+
+class _ObjectExtras():
+    """
+    Rarely used state of a UI object, it's created only when one of the values is set so most objects don't pay for it
+    """
+    __slots__ = ('drawn_bounds', 'manager', 'listeners', 'listener_counts')
+
+    def __init__(self):
+        # Where object was drawn last time, used by dirty tracking
+        self.drawn_bounds = None
+        # UIManager of a top container
+        self.manager = None
+        # Event type -> list of (listener, capture) pairs
+        self.listeners = None
+        # Event type -> amount of listeners of this object and all its sub objects, lets dispatcher skip subtrees without listeners
+        self.listener_counts = None
+
+def _extra(name:str) -> property:
+    """
+    Returns property keeping its value in '_extras' of an object, setting None doesn't create them
+    """
+    def get(self):
+        extras = self._extras
+        return None if extras is None else getattr(extras, name)
+
+    def set(self, value):
+        extras = self._extras
+
+        if extras is None:
+            if value is None:
+                return
+
+            extras = self._extras = _ObjectExtras()
+
+        setattr(extras, name, value)
+
+    return property(get, set)
+
+# Object -> how many batches of it are open, only objects inside a batch are here
+_batch_depths = {}
+
+class CompactUIObject():
+    """
+    Base of all UI objects, keeps its state in slots and geometry in four separate numbers instead of a tuple, so huge amounts of objects take less memory.
+    Rarely used state lives in '_extras' created only when it's needed. Compact objects don't allow setting attributes that aren't declared in '__slots__'
+    """
+    __slots__ = ('_x', '_y', '_width', '_height', '_parent', '_owner', '_dirty', '_absolute_pos', '_extras')
+
     def __init__(self, placement:tuple):
+        self._parent = None
+        # Object that draws this one as its part, ex. button drawing its label
+        self._owner = None
+
+        # Dirty tracking, object is dirty until it's drawn for the first time
+        self._dirty = True
+
+        # Cached result of get_absolute_pos
+        self._absolute_pos = None
+
+        # Drawn bounds, manager and event listeners, None until one of them is set
+        self._extras = None
+
         self.placement = placement # (x, y, width, height)
 
-        # self.__sub_objects = []
+    _drawn_bounds = _extra('drawn_bounds')
+    _listeners = _extra('listeners')
+    _listener_counts = _extra('listener_counts')
 
-        self._parent = None
+    @property
+    def _manager(self) -> Optional['UIManager']:
+        """
+        UIManager that keeps track of this object, it's kept only by the top container
+        """
+        obj = self
+        while obj._parent is not None:
+            obj = obj._parent
+
+        extras = obj._extras
+        return None if extras is None else extras.manager
+
+    @_manager.setter
+    def _manager(self, manager:Optional['UIManager']):
+        if manager is not None or self._extras is not None:
+            if self._extras is None:
+                self._extras = _ObjectExtras()
+
+            self._extras.manager = manager
+
+    @property
+    def _batch_depth(self) -> int:
+        """
+        How many batches are currently open, refreshing is postponed until the last one ends
+        """
+        return _batch_depths.get(self, 0) if _batch_depths else 0
+
+    @_batch_depth.setter
+    def _batch_depth(self, depth:int):
+        if depth:
+            _batch_depths[self] = depth
+        else:
+            _batch_depths.pop(self, None)
 
     @property
     def placement(self) -> tuple:
-        return self._placement
+        return (self._x, self._y, self._width, self._height)
 
     @placement.setter
     def placement(self, p:tuple):
-        self._placement = p
+        self._x, self._y, self._width, self._height = p
+
+        self._placement_changed()
+
+    def _placement_changed(self):
+        """
+        Called every time placement has been changed, override it to adjust things depending on placement
+        """
+        self._invalidate_absolute_pos()
+        self.mark_dirty()
+
+        manager = self._manager
+        if manager is not None:
+            manager._object_moved(self)
+
+        # Layout of the parent remembers sizes of its sub objects
+        if self._parent is not None and self._parent._layout is not None:
+            self._parent._layout._sub_object_placed(self)
 
     @property
     def size(self) -> tuple:
-        return (self.placement[2], self.placement[3])
+        return (self._width, self._height)
     
     @size.setter
     def size(self, s:tuple):
-        self.placement = (self.x, self.y, *s)
+        self._width, self._height = s
+
+        self._placement_changed()
     
     @property
     def width(self) -> int:
-        return self.placement[2]
+        return self._width
     
     @property
     def height(self) -> int:
-        return self.placement[3]
+        return self._height
 
     @property
     def position(self) -> tuple:
-        return self.placement[:2]
+        return (self._x, self._y)
     
     @position.setter
     def position(self, pos:tuple):
-        self.placement = (*pos, self.width, self.height)
+        self._x, self._y = pos
+
+        self._placement_changed()
     
     @property
     def x(self) -> int:
-        return self.placement[0]
+        return self._x
 
     @x.setter
     def x(self, new_x:int):
-        self.placement = (new_x, *self.placement[1:])
+        self._x = new_x
+
+        self._placement_changed()
     
     @property
     def y(self) -> int:
-        return self.placement[1]
+        return self._y
 
     @y.setter
     def y(self, new_y:int):
-        self.placement = (self.x, new_y, *self.size)
+        self._y = new_y
+
+        self._placement_changed()
 
     def draw(self, surface):
         """
@@ -71,617 +446,3197 @@ class UIObject():
         """
         Return the absolute postion of an boject relative to the top left corner of the screen
         """
-        if self._parent is None:
-            return self.position
-        
-        parent_x, parent_y = self._parent.get_absolute_pos()
+        if self._absolute_pos is None:
+            if self._parent is None:
+                self._absolute_pos = self.position
+            else:
+                parent_x, parent_y = self._parent.get_absolute_pos()
 
-        return (self.x + parent_x, self.y + parent_y)
+                self._absolute_pos = (self.x + parent_x, self.y + parent_y)
 
-class Surfaces(UIObject):
-    def __init__(self, placement:tuple, color:tuple, alpha:int):
-        super().__init__(placement)
-        self._color = color
-        self._alpha = alpha
+        return self._absolute_pos
 
-        self._createSurface()
+    def _invalidate_absolute_pos(self):
+        """
+        Forgets cached absolute position, it will be calculated again when needed
+        """
+        self._absolute_pos = None
 
-    @property
-    def color(self) -> tuple:
-        return self._color
-    
-    @color.setter
-    def color(self, c:tuple):
-        self._color = c
-        self.surface.fill((*self._color, self._alpha))
+    def get_bounds(self) -> pygame.Rect:
+        """
+        Returns rectangle covering everything that object draws, relative to the surface it is drawn on
+        """
+        return pygame.Rect(self.placement)
 
-    @property
-    def alpha(self) -> int:
-        return self._alpha
+    def _get_blits(self) -> Optional[list]:
+        """
+        Returns (surface, position) pairs that draw the object or None if it has to be drawn with 'draw'
+        """
+        return None
 
-    @alpha.setter
-    def alpha(self, a:int):
-        self._alpha = a
-        self.surface.fill((*self._color, self._alpha))
+    @contextmanager
+    def batch(self):
+        """
+        Postpones refreshing an object, like rendering its label, until all changes made inside 'with' block are applied
+        """
+        parts = self._batched_parts()
 
-    def _createSurface(self):
+        self._batch_depth += 1
+        for part in parts:
+            part._batch_depth += 1
+
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            for part in parts:
+                part._batch_depth -= 1
+
+            if self._batch_depth == 0:
+                self._flush_batch()
+
+            for part in parts:
+                if part._batch_depth == 0:
+                    part._flush_batch()
+
+    def update(self, **properties):
         """
-        Creates main object surface and sets its color and alpha 
+        Sets all given properties at once and refreshes object only one time, ex. button.update(placement=(0, 0, 100, 50), text='Ok')
         """
-        # Create main surface
-        self.surface = pygame.Surface(self.size, pygame.SRCALPHA)
+        with self.batch():
+            for name, value in properties.items():
+                setattr(self, name, value)
 
-        # Set color and alpha
-        self.surface.fill((*self._color, self._alpha))
+        return self
 
-    def add_sub_object(self, obj:Type[UIObject]):
+    def _batched_parts(self) -> tuple:
         """
-        Adds given object as a subobject 
+        Returns objects drawn as part of this one which should be batched together with it
         """
-        self._sub_objects.append(obj)
+        return ()
 
-        obj._parent = self
+    def _text_request(self) -> Optional[tuple]:
+        """
+        Returns (font, size, text, color) of text that object renders with 'text_cache' or None
+        """
+        return None
 
-    def delete_sub_object(self, obj:Type[UIObject]):
+    def _flush_batch(self):
         """
-        Delets given object from subobjects
+        Called when the last batch ends, override it to do postponed refreshing
         """
-        self._sub_objects.remove(obj)
+        pass
 
-        obj._parent = None  
+    def add_event_listener(self, event_type:int, listener:Callable, capture:bool=False):
+        """
+        Calls listener with UIEvent when event of given type reaches this object through UIManager. Capturing listeners are called
+        on the way down from the top container to the target, others when event bubbles back up. Listener can stop event by calling
+        'event.consume()' or returning True
+        """
+        if self._listeners is None:
+            self._listeners = {}
 
-class Placeholder(Surfaces):
-    def __init__(self, placement:tuple):
-        super().__init__(placement, (0, 0, 0), 0)
+        self._listeners.setdefault(event_type, []).append((listener, capture))
+        self._add_listener_counts({event_type: 1})
 
-        self._sub_objects = []
+    def remove_event_listener(self, event_type:int, listener:Callable, capture:bool=False):
+        """
+        Removes listener added with 'add_event_listener'
+        """
+        try:
+            self._listeners[event_type].remove((listener, capture))
+        except (TypeError, KeyError, ValueError):
+            print("\033[91m Given listener isn't listening to this event type \033[0m")
+            return
 
+        if not self._listeners[event_type]:
+            del self._listeners[event_type]
 
-    def draw(self, surface):
+        self._add_listener_counts({event_type: -1})
+
+    def _add_listener_counts(self, counts:dict):
         """
-        Draws itself and its subobjects on a given surface
+        Adds given amounts of listeners per event type to this object and all its parents
         """
-        # Clear before drawing
-        self.surface.fill((0, 0, 0, 0))
+        obj = self
+        while obj is not None:
+            if obj._listener_counts is None:
+                obj._listener_counts = {}
 
-        # Check if has sub objects and if so then draw them
-        if self._sub_objects:
+            for event_type, count in counts.items():
+                count += obj._listener_counts.get(event_type, 0)
 
-            for obj in self._sub_objects:
-                # Draw subobjects and their subobjects to their surface
-                obj.draw(self.surface)
+                if count:
+                    obj._listener_counts[event_type] = count
+                else:
+                    obj._listener_counts.pop(event_type, None)
 
-        # Blit main surface to given surface
-        surface.blit(self.surface, self.position)
+            obj = obj._parent
 
-    # ---- Placeholders has no color and alpha=0 ----
-    @property
-    def color(self) -> None:
-        return None
+    def mark_dirty(self):
+        """
+        Marks object as changed so containers with dirty tracking or retained surface redraw it, call it after changing things that don't do it by themselves
+        """
+        self._dirty = True
 
-    @color.setter
-    def color(self, c:tuple):
-        pass
+        if self._owner is not None:
+            self._owner.mark_dirty()
+        elif self._parent is not None:
+            self._parent._sub_object_changed()
 
-    @property
-    def alpha(self) -> 0:
-        return 0
+    def _dirty_regions(self) -> list:
+        """
+        Returns rectangles that have to be redrawn on the surface the object is drawn on
+        """
+        if not self._dirty:
+            return []
 
-    @alpha.setter
-    def alpha(self, a:int):
-        pass
+        if self._drawn_bounds is None:
+            return [self.get_bounds()]
 
-class Background(Surfaces):
-    def __init__(self, placement:tuple, color:tuple, alpha:int):
-        super().__init__(placement, color, alpha)
-        
-        self._sub_objects = []
+        # Clear old area and draw new one
+        return [self.get_bounds().union(self._drawn_bounds)]
 
-    def draw(self, surface):
+    def _clean(self):
         """
-        Draws itself and its subobjects on a given surface
+        Marks object as drawn
         """
-        # Clean before drawing
-        self.surface.fill((*self.color, self.alpha))
-        
-        # Check if has sub objects and if so then draw them
-        if self._sub_objects:
+        self._dirty = False
+        self._drawn_bounds = self.get_bounds()
+
+class UIObject(CompactUIObject):
+    """
+    Base of all UI objects, any attribute can be set on it
+    """
+
+class Layout():
+    """
+    Base of layouts placing sub objects of a placeholder or a background. Placements of all sub objects are computed in one pass
+    and every sub object is updated once, only when its placement has changed
+    """
+    def __init__(self, spacing:int=0, padding:int=0):
+        self._spacing = spacing
+        self._padding = padding
+
+        # Sub object -> size it wants to have, measured when it's laid out for the first time
+        self._sizes = {}
+        # Sub object -> how much of the free space it takes
+        self._weights = {}
+        # Sub object -> size it has been given by the last layout, other sizes are set by the application
+        self._applied_sizes = {}
+
+        # Containers using this layout
+        self._containers = []
 
-            for obj in self._sub_objects:
-                # Draw subobjects and their subobjects to their surface
-                obj.draw(self.surface)
+    @property
+    def spacing(self) -> int:
+        return self._spacing
 
-        # Blit main surface to given surface
-        surface.blit(self.surface, self.position)
+    @spacing.setter
+    def spacing(self, s:int):
+        self._spacing = s
+        self.invalidate()
 
+    @property
+    def padding(self) -> int:
+        return self._padding
 
-class Button(UIObject):
-    def __init__(self, placement:tuple, color:tuple, text:str, alpha:int=255, font_size:Optional[int]=None, font_color:tuple=(0, 0, 0), font:str="monospace", click_function:Optional[Callable]=None):
-        self.label = None
-        super().__init__(placement)
-        self.font = font
-        self.font_size = font_size
-        self.font_color = font_color
-        self.color = color
-        self.alpha = alpha
+    @padding.setter
+    def padding(self, p:int):
+        self._padding = p
+        self.invalidate()
 
-        lab_placement = (round(placement[0] + (placement[2]/8)), round(placement[1] + (placement[3]/8)), round(placement[2]* (3/4)), round(placement[3] * (3/4)))
-        self.label = Label(lab_placement, text, font_size=font_size, font_color=font_color, alpha=alpha, font=font)
-        # Make sure that label is centered
-        self.label.x = ((placement[2] - self.label.get_width())/2) + placement[0]
-        self.label.y = ((placement[3] - self.label.get_height())/2) + placement[1]
+    def set_size(self, obj:Type[CompactUIObject], size:tuple):
+        """
+        Sets size that given sub object wants to have
+        """
+        self._sizes[obj] = tuple(size)
+        self.invalidate()
 
-        self.text = text
-        self.click_function = click_function
+    def set_weight(self, obj:Type[CompactUIObject], weight:Union[int, float]):
+        """
+        Sets how much of the free space given sub object takes, objects with weight 0 keep their size
+        """
+        self._weights[obj] = weight
+        self.invalidate()
 
-    @property
-    def text(self) -> str:
-        return self._text
+    def measure(self, obj:Type[CompactUIObject]) -> tuple:
+        """
+        Returns size that given sub object wants to have, it's measured only once and measured again when the object is resized
+        by something else than the layout
+        """
+        size = self._sizes.get(obj)
 
-    @text.setter
-    def text(self, t:str):
-        # Render new label
-        self._text = t
-        
-        if not self.label is None:
-            self.label.text = t
+        if size is None:
+            size = self._sizes[obj] = obj.size
 
-    @property
-    def alpha(self) -> int:
-        return self._alpha
+        return size
 
-    @alpha.setter
-    def alpha(self, a:int):
-        self._alpha = a
-        if self.label is not None:
-            self.label.alpha = a
+    def forget(self, obj:Type[CompactUIObject]):
+        """
+        Forgets measured size and weight of a sub object, it will be measured again when it's laid out
+        """
+        self._sizes.pop(obj, None)
+        self._weights.pop(obj, None)
+        self._applied_sizes.pop(obj, None)
+        self.invalidate()
 
-    def draw(self, surface):
+    def _sub_object_placed(self, obj:Type[CompactUIObject]):
         """
-        Draws itself on a given surface
+        Called when placement of a sub object has changed, the size it wants to have changes when it's resized by something else than the layout
         """
-        # Draw button
-        pygame.draw.rect(surface, (*self.color, self.alpha), self.placement)
-        # Draw label
-        self.label.draw(surface)
+        applied = self._applied_sizes.get(obj)
 
-    def clicked(self, pos:tuple) -> bool:
+        if applied is not None and obj.size != applied:
+            self._sizes[obj] = obj.size
+            self._applied_sizes.pop(obj)
+            self.invalidate()
+
+    def invalidate(self):
         """
-        Checks if button is clicked for given mouse position and runs specified 'click_function'
+        Lays out containers using this layout again before they are drawn
         """
-        if pos[0] > self.get_absolute_pos()[0] and pos[0] < self.width + self.get_absolute_pos()[0]:
-            if pos[1] > self.get_absolute_pos()[1]  and pos[1] < self.height + self.get_absolute_pos()[1] :
-                # If user speciefied small function execute it
-                if self.click_function is not None:
-                    self.click_function()
+        for container in self._containers:
+            container._layout_changed()
 
-                return True
+    def apply(self, container):
+        """
+        Places all sub objects of a container
+        """
+        area = pygame.Rect(0, 0, container.width, container.height).inflate(-self._padding * 2, -self._padding * 2)
+        objects = container._sub_objects
 
-        return False
-    
-    # ---- OVERRING POSITION AND SIZE SETTER TO RELOAD LABEL POSTION AFTER ----
-    @property
-    def placement(self) -> tuple:
-        return self._placement
+        applied_sizes = self._applied_sizes
+        # Sizes given now aren't changes made by the application
+        applied_sizes.clear()
 
-    @placement.setter
-    def placement(self, p:tuple):
-        self._placement = p
+        for obj, placement in zip(objects, self._placements(objects, area)):
+            if obj.placement != placement:
+                # Object refreshes itself once for the whole placement
+                obj.update(placement=placement)
 
-        self._adjust_label()
-    
-    def _adjust_label(self):
+            applied_sizes[obj] = placement[2:]
+
+    def _placements(self, objects:list, area:pygame.Rect) -> list:
         """
-        Adjust label position after button size or placement has been changed
+        Returns placements of given objects inside of the area, override it in your own layouts
         """
-        if self.label is not None:
-            # Change label size to calculate new max font etc.
-            self.label.size = (round(self.width* (3/4)), round(self.height * (3/4)))
-            self.label.reload_label()
+        return [obj.placement for obj in objects]
 
-            # Update label position
-            self.label.position = (((self.width - self.label.get_width())/2) + self.x, ((self.height - self.label.get_height())/2) + self.y)
+class _BoxLayout(Layout):
+    """
+    Places sub objects one after another along the main axis
+    """
+    # Index of the main axis in (x, y) and (width, height)
+    _axis = 0
 
-class Checkbox(UIObject):
-    def __init__(self, placement:tuple, checkbox_color:tuple, indicator_color:tuple, text:str, spacing:Optional[int]=None, alpha:int=255, 
-                font:str="monospace", font_size:Optional[int]=None, font_color:tuple=(0, 0, 0), click_function:Optional[Callable]=None):
+    def __init__(self, spacing:int=0, padding:int=0, align:str='start', stretch:bool=False):
+        super().__init__(spacing, padding)
+
+        self.align = align
+        # Fill the whole cross axis
+        self.stretch = stretch
+
+    @property
+    def align(self) -> str:
+        return self._align
+
+    @align.setter
+    def align(self, a:str):
+        if a not in ('start', 'center', 'end'):
+            raise ValueError("\033[91m Align has to be 'start', 'center' or 'end' \033[0m")
+
+        self._align = a
+        self.invalidate()
+
+    @property
+    def stretch(self) -> bool:
+        return self._stretch
+
+    @stretch.setter
+    def stretch(self, s:bool):
+        self._stretch = s
+        self.invalidate()
+
+    def _placements(self, objects:list, area:pygame.Rect) -> list:
+        main, cross = self._axis, 1 - self._axis
+        area_pos, area_size = area.topleft, area.size
+
+        sizes = [self.measure(obj) for obj in objects]
+        weights = [self._weights.get(obj, 0) for obj in objects]
+
+        # Space left after all objects and spacing, shared by weights
+        free = area_size[main] - sum(size[main] for size in sizes) - self._spacing * max(len(objects) - 1, 0)
+        total_weight = sum(weights)
+
+        placements = []
+        position = area_pos[main]
+
+        for size, weight in zip(sizes, weights):
+            main_size = size[main]
+            if total_weight and free > 0:
+                main_size += int(free * weight / total_weight)
+
+            cross_size = area_size[cross] if self._stretch else size[cross]
+
+            if self._align == 'start' or self._stretch:
+                cross_position = area_pos[cross]
+            elif self._align == 'center':
+                cross_position = area_pos[cross] + (area_size[cross] - cross_size) // 2
+            else:
+                cross_position = area_pos[cross] + area_size[cross] - cross_size
+
+            if main == 0:
+                placements.append((position, cross_position, main_size, cross_size))
+            else:
+                placements.append((cross_position, position, cross_size, main_size))
+
+            position += main_size + self._spacing
+
+        return placements
+
+class RowLayout(_BoxLayout):
+    """
+    Places sub objects from left to right
+    """
+    _axis = 0
+
+class ColumnLayout(_BoxLayout):
+    """
+    Places sub objects from top to bottom
+    """
+    _axis = 1
+
+class GridLayout(Layout):
+    """
+    Places sub objects in a grid with given amount of columns, all columns have the same width
+    """
+    def __init__(self, columns:int, spacing:int=0, padding:int=0, row_height:Optional[int]=None):
+        super().__init__(spacing, padding)
+
+        self.columns = columns
+        # When None every row is as tall as its tallest object
+        self.row_height = row_height
+
+    @property
+    def columns(self) -> int:
+        return self._columns
+
+    @columns.setter
+    def columns(self, c:int):
+        if c < 1:
+            raise ValueError("\033[91m Grid needs at least one column \033[0m")
+
+        self._columns = c
+        self.invalidate()
+
+    @property
+    def row_height(self) -> Optional[int]:
+        return self._row_height
+
+    @row_height.setter
+    def row_height(self, h:Optional[int]):
+        self._row_height = h
+        self.invalidate()
+
+    def _placements(self, objects:list, area:pygame.Rect) -> list:
+        columns = self._columns
+        column_width = (area.width - self._spacing * (columns - 1)) // columns
+
+        placements = []
+        y = area.top
+
+        for start in range(0, len(objects), columns):
+            row = objects[start:start + columns]
+            height = self._row_height if self._row_height is not None else max(self.measure(obj)[1] for obj in row)
+
+            for column in range(len(row)):
+                placements.append((area.left + column * (column_width + self._spacing), y, column_width, height))
+
+            y += height + self._spacing
+
+        return placements
+
+class Surfaces(UIObject):
+    def __init__(self, placement:tuple, color:tuple, alpha:int, dirty_tracking:bool=False, retained:bool=False, cull_children:bool=False):
+        self._sub_objects = []
+        # True when any of sub objects or their sub objects has changed since the last draw
+        self._content_dirty = False
+
+        # Layout placing sub objects and if it has to be applied again
+        self._layout = None
+        self._layout_dirty = False
+
+        # Created once placement and color are known
+        self.surface = None
+
+        super().__init__(placement)
+        self._color = color
+        self._alpha = alpha
+        self._dirty_tracking = dirty_tracking
+        self.retained = retained
+        # Don't draw sub objects that are outside of the surface
+        self.cull_children = cull_children
+
+        # Areas left by deleted sub objects
+        self._removed_regions = []
+
+        # RLE encode surface when it doesn't change, blending of translucent pixels may differ by a few color levels
+        self.rle = False
+        # How many draws in a row haven't changed the surface and if it's RLE encoded
+        self._static_frames = 0
+        self._rle = False
+
+        self._createSurface()
+
+    @property
+    def color(self) -> tuple:
+        return self._color
+    
+    @color.setter
+    def color(self, c:tuple):
+        self._color = c
+        self.surface.fill((*self._color, self._alpha))
+        self.mark_dirty()
+
+    @property
+    def alpha(self) -> int:
+        return self._alpha
+
+    @alpha.setter
+    def alpha(self, a:int):
+        opacity_changed = (a == 255) != (self._alpha == 255)
+        self._alpha = a
+
+        if opacity_changed:
+            self._createSurface()
+        else:
+            self.surface.fill((*self._color, self._alpha))
+
+        self.mark_dirty()
+
+    @property
+    def dirty_tracking(self) -> bool:
+        # Containers inside a dirty tracking container are tracked as well
+        if self._dirty_tracking:
+            return True
+
+        return self._parent is not None and self._parent.dirty_tracking
+
+    @dirty_tracking.setter
+    def dirty_tracking(self, d:bool):
+        self._dirty_tracking = d
+        self.mark_dirty()
+
+    @property
+    def layout(self) -> Optional[Layout]:
+        return self._layout
+
+    @layout.setter
+    def layout(self, l:Optional[Layout]):
+        if self._layout is not None:
+            self._layout._containers.remove(self)
+
+        self._layout = l
+        self._layout_dirty = False
+
+        if l is not None:
+            l._containers.append(self)
+            self._layout_changed()
+
+    def _layout_changed(self):
+        """
+        Called when sub objects have to be laid out again, it's done once before the next draw
+        """
+        self._layout_dirty = True
+        self._sub_object_changed()
+
+    def apply_layout(self):
+        """
+        Places sub objects with the layout if anything has changed, it's called before drawing so you need it only to read placements earlier
+        """
+        if self._layout_dirty:
+            self._layout_dirty = False
+            self._layout.apply(self)
+
+    def _placement_changed(self):
+        super()._placement_changed()
+
+        # Surface has to cover the new size, sub objects are drawn on the new one from scratch
+        if self.surface is not None and self.surface.get_size() != (int(self._width), int(self._height)):
+            self._createSurface()
+
+        if self._layout is not None:
+            self._layout_changed()
+
+    def _sub_object_changed(self):
+        """
+        Called when one of sub objects or their sub objects has changed, passes information up to the top container
+        """
+        # Parents already know about previous change
+        if self._content_dirty:
+            return
+
+        self._content_dirty = True
+
+        if self._parent is not None:
+            self._parent._sub_object_changed()
+
+    def _createSurface(self):
+        """
+        Creates main object surface and sets its color and alpha 
+        """
+        # Create main surface, opaque one doesn't need per-pixel alpha which makes blitting it much faster
+        if self._alpha == 255:
+            self.surface = pygame.Surface(self.size)
+        else:
+            self.surface = pygame.Surface(self.size, pygame.SRCALPHA)
+
+        # Set color and alpha
+        self.surface.fill((*self._color, self._alpha))
+
+        self._rle = False
+        self._convert()
+
+    def _convert(self):
+        """
+        Converts surface to the display format once a display exists
+        """
+        converted = _to_display_format(self.surface)
+
+        self._converted = converted is not None
+        if self._converted:
+            self.surface = converted
+
+    def _update_rle(self, target:pygame.Surface, regions:list):
+        """
+        RLE encodes transparent surface that hasn't changed for a few draws and is drawn on an opaque surface, which makes blitting
+        its transparent parts almost free. Encoding is removed as soon as the surface changes, because modifying RLE surface is slow
+        """
+        if regions or not self.rle:
+            self._static_frames = 0
+
+            if self._rle:
+                self.surface.set_alpha(255)
+                self._rle = False
+
+            return
+
+        self._static_frames += 1
+
+        if (not self._rle and self._static_frames >= 3 and self.surface.get_flags() & pygame.SRCALPHA
+            and not target.get_flags() & pygame.SRCALPHA):
+            self.surface.set_alpha(255, pygame.RLEACCEL)
+            self._rle = True
+
+    def _invalidate_absolute_pos(self):
+        """
+        Forgets cached absolute position of itself and all its sub objects
+        """
+        # Sub objects can be cached only if their parent is, so there is nothing to forget
+        if self._absolute_pos is None:
+            return
+
+        self._absolute_pos = None
+
+        for obj in self._sub_objects:
+            obj._invalidate_absolute_pos()
+
+    def add_sub_object(self, obj:Type[CompactUIObject]):
+        """
+        Adds given object as a subobject 
+        """
+        self._sub_objects.append(obj)
+
+        obj._parent = self
+        obj._invalidate_absolute_pos()
+
+        if obj._listener_counts:
+            self._add_listener_counts(obj._listener_counts)
+
+        if self._layout is not None:
+            self._layout_changed()
+
+        if self._manager is not None:
+            self._manager._tree_changed()
+        
+        # Object has never been drawn on this surface
+        obj._drawn_bounds = None
+        obj.mark_dirty()
+
+    def delete_sub_object(self, obj:Type[CompactUIObject]):
+        """
+        Delets given object from subobjects
+        """
+        self._sub_objects.remove(obj)
+
+        obj._parent = None  
+        obj._invalidate_absolute_pos()
+
+        if obj._listener_counts:
+            self._add_listener_counts({event_type: -count for event_type, count in obj._listener_counts.items()})
+
+        if self._layout is not None:
+            self._layout.forget(obj)
+
+        if self._manager is not None:
+            self._manager._tree_changed()
+
+        # Clear the area where object was drawn
+        if obj._drawn_bounds is not None:
+            self._removed_regions.append(obj._drawn_bounds)
+            obj._drawn_bounds = None
+
+        self._sub_object_changed()
+
+    def draw(self, surface) -> list:
+        """
+        Draws itself and its subobjects on a given surface, returns list of changed rectangles on that surface which can be passed to 'pygame.display.update'
+        """
+        # Remember where moved container was drawn before
+        moved_from = self._drawn_bounds if self._dirty and self._drawn_bounds != self.get_bounds() else None
+
+        regions = self._compose()
+        self._update_rle(surface, regions)
+
+        # Parent redraws only clipped area of its surface, blit everything and let it clip
+        if not self.dirty_tracking or self._parent is not None:
+            # Blit main surface to given surface
+            return [surface.blit(self.surface, self.position)]
+
+        # Blit only changed parts
+        changed = [surface.blit(self.surface, region.move(self.position), region) for region in regions]
+
+        # Old area of moved container has changed as well
+        if moved_from is not None:
+            changed.append(moved_from.clip(surface.get_rect()))
+
+        return changed
+
+    def _get_blits(self) -> list:
+        regions = self._compose()
+        self._update_rle(self._parent.surface, regions)
+
+        return [(self.surface, self.position)]
+
+    def _compose(self) -> list:
+        """
+        Brings its surface up to date and returns rectangles of it that have changed
+        """
+        # Display has been created after this container
+        if not self._converted:
+            self._convert()
+
+        self.apply_layout()
+
+        if self.dirty_tracking:
+            if self._dirty:
+                # Container itself has changed, redraw everything
+                regions = [pygame.Rect((0, 0), self.size)]
+            else:
+                regions = self._local_dirty_regions()
+
+            self._removed_regions = []
+
+            if regions:
+                self._redraw_regions(regions)
+
+        elif self.retained and not self._dirty and not self._content_dirty:
+            # Nothing has changed since the last draw, reuse what was drawn
+            regions = []
+
+        else:
+            # Clean before drawing
+            self.surface.fill((*self._color, self._alpha))
+
+            self._draw_sub_objects(self._sub_objects)
+
+            regions = [pygame.Rect((0, 0), self.size)]
+
+        self._content_dirty = False
+        self._clean()
+
+        return regions
+
+    def _draw_sub_objects(self, objects:list):
+        """
+        Draws given sub objects on its surface, objects that are just images are drawn together with a single 'blits' call
+        """
+        if self.cull_children:
+            surface_rect = self.surface.get_rect()
+            objects = [obj for obj in objects if obj.get_bounds().colliderect(surface_rect)]
+
+        pending = []
+
+        for obj in objects:
+            blits = obj._get_blits()
+
+            if blits is None:
+                # Keep drawing order, draw waiting images first
+                if pending:
+                    self.surface.blits(pending, doreturn=False)
+                    pending = []
+
+                # Draw subobjects and their subobjects to their surface
+                obj.draw(self.surface)
+            else:
+                pending.extend(blits)
+
+        if pending:
+            self.surface.blits(pending, doreturn=False)
+
+    def _local_dirty_regions(self) -> list:
+        """
+        Returns merged rectangles of its surface that have to be redrawn
+        """
+        # Nothing has changed so there is no need to look at sub objects
+        if not self._content_dirty:
+            return []
+
+        regions = list(self._removed_regions)
+
+        for obj in self._sub_objects:
+            regions.extend(obj._dirty_regions())
+
+        surface_rect = self.surface.get_rect()
+        merged = []
+
+        for region in regions:
+            region = region.clip(surface_rect)
+
+            if region.width == 0 or region.height == 0:
+                continue
+
+            # Join overlapping regions so nothing is redrawn twice
+            index = region.collidelist(merged)
+            while index != -1:
+                region = region.union(merged.pop(index))
+                index = region.collidelist(merged)
+
+            merged.append(region)
+
+        return merged
+
+    def _redraw_regions(self, regions:list):
+        """
+        Clears given rectangles of its surface and draws sub objects touching them
+        """
+        for region in regions:
+            self.surface.set_clip(region)
+            self.surface.fill((*self._color, self._alpha), region)
+
+            self._draw_sub_objects([obj for obj in self._sub_objects if obj.get_bounds().colliderect(region)])
+
+        self.surface.set_clip(None)
+
+        for obj in self._sub_objects:
+            obj._clean()
+
+    def _dirty_regions(self) -> list:
+        if self._dirty or not self.dirty_tracking:
+            return super()._dirty_regions()
+
+        # Only changed parts of its surface have to be redrawn on parent surface
+        return [region.move(self.position) for region in self._local_dirty_regions()]
+
+class Placeholder(Surfaces):
+    def __init__(self, placement:tuple, dirty_tracking:bool=False, retained:bool=False, cull_children:bool=False):
+        super().__init__(placement, (0, 0, 0), 0, dirty_tracking, retained, cull_children)
+
+    # ---- Placeholders has no color and alpha=0 ----
+    @property
+    def color(self) -> None:
+        return None
+
+    @color.setter
+    def color(self, c:tuple):
+        pass
+
+    @property
+    def alpha(self) -> 0:
+        return 0
+
+    @alpha.setter
+    def alpha(self, a:int):
+        pass
+
+class Background(Surfaces):
+    def __init__(self, placement:tuple, color:tuple, alpha:int, dirty_tracking:bool=False, retained:bool=False, cull_children:bool=False):
+        super().__init__(placement, color, alpha, dirty_tracking, retained, cull_children)
+
+class _UniformOffsets():
+    """
+    Tops of rows which all have the same height, computed instead of stored so any amount of rows takes no memory
+    """
+    __slots__ = ('row_height', 'row_count')
+
+    def __init__(self, row_height:int, row_count:int):
+        self.row_height = row_height
+        self.row_count = row_count
+
+    def __len__(self) -> int:
+        return self.row_count + 1
+
+    def __getitem__(self, index:int) -> int:
+        if index < 0:
+            index += self.row_count + 1
+
+        if not 0 <= index <= self.row_count:
+            raise IndexError('row offset index out of range')
+
+        return index * self.row_height
+
+class ScrollList(Placeholder):
+    """
+    Placeholder showing a list with any amount of rows, only rows in view have widgets. Widgets of rows leaving the view are reused for rows
+    coming into it and content that stays in view is moved with 'Surface.scroll' instead of being drawn again, so scrolling costs the same
+    for 100 and 100000 rows
+    """
+    def __init__(self, placement:tuple, row_count:int, create_row:Callable, update_row:Callable, row_height:Union[int, Callable]=20, dirty_tracking:bool=False):
+        # Row index -> widget showing it
+        self._rows = {}
+        # Widgets of rows that left the view, ready to be reused
+        self._free = []
+
+        self._scroll = 0
+        # Scroll of the content on the surface, None when nothing has been drawn
+        self._drawn_scroll = None
+        self._rows_dirty = True
+
+        super().__init__(placement, dirty_tracking, retained=True)
+
+        self.create_row = create_row
+        self.update_row = update_row
+        self._row_height = row_height
+        self._row_count = row_count
+
+        self._build_index()
+
+    @property
+    def row_count(self) -> int:
+        return self._row_count
+
+    @row_count.setter
+    def row_count(self, n:int):
+        old = self._row_count
+        self._row_count = n
+
+        self._resize_index(old)
+
+        # Rows that are still in the list keep their widgets and content
+        for index in [i for i in self._rows if i >= n]:
+            widget = self._rows.pop(index)
+            self.delete_sub_object(widget)
+            self._free.append(widget)
+
+        self.scroll = self._scroll
+        self._rows_dirty = True
+
+        # Redraw only when added or removed rows are in view
+        if self._offsets[min(old, n)] < self._scroll + self.height:
+            self.mark_dirty()
+
+    @property
+    def row_height(self) -> Union[int, Callable]:
+        return self._row_height
+
+    @row_height.setter
+    def row_height(self, h:Union[int, Callable]):
+        self._row_height = h
+
+        self._build_index()
+        self.refresh_rows()
+
+    @property
+    def content_height(self) -> int:
+        """
+        Height of all rows together
+        """
+        return self._offsets[-1]
+
+    @property
+    def scroll(self) -> int:
+        """
+        How many pixels of the content are scrolled above the top edge
+        """
+        return self._scroll
+
+    @scroll.setter
+    def scroll(self, s:int):
+        s = int(max(0, min(s, self.content_height - self.height)))
+
+        if s == self._scroll:
+            return
+
+        self._scroll = s
+        self._rows_dirty = True
+        self._sub_object_changed()
+
+    def scroll_by(self, dy:int):
+        """
+        Scrolls content by given amount of pixels, positive values move down the list
+        """
+        self.scroll = self._scroll + dy
+
+    def scroll_to_row(self, index:int):
+        """
+        Scrolls so the given row is at the top
+        """
+        self.scroll = self.row_top(index)
+
+    def row_top(self, index:int) -> int:
+        """
+        Returns y coordinate of the top of a row in the content
+        """
+        return self._offsets[index]
+
+    def row_at(self, y:int) -> Optional[int]:
+        """
+        Returns index of a row at given y coordinate of the content or None if there is no row
+        """
+        if y < 0 or y >= self.content_height:
+            return None
+
+        return bisect_right(self._offsets, y) - 1
+
+    def visible_rows(self) -> range:
+        """
+        Returns indexes of rows which are at least partly in view
+        """
+        if self._row_count == 0:
+            return range(0)
+
+        first = bisect_right(self._offsets, self._scroll) - 1
+        stop = bisect_left(self._offsets, self._scroll + self.height, first)
+
+        return range(first, min(stop, self._row_count))
+
+    def refresh_rows(self):
+        """
+        Calls 'update_row' again for all rows in view, call it when data shown in rows has changed
+        """
+        for index, widget in list(self._rows.items()):
+            self._rows.pop(index)
+            self.delete_sub_object(widget)
+            self._free.append(widget)
+
+        # Row heights may have changed
+        self.scroll = self._scroll
+        self._rows_dirty = True
+        self.mark_dirty()
+
+    def _placement_changed(self):
+        surface = self.surface
+        super()._placement_changed()
+
+        # New surface for a new size is empty, there is no drawn content to scroll
+        if self.surface is not surface:
+            self._drawn_scroll = None
+
+        # Rows have to fit new size
+        if self._rows:
+            self.refresh_rows()
+        else:
+            self._rows_dirty = True
+
+    def _build_index(self):
+        """
+        Computes top of every row, rows are found with a binary search over it
+        """
+        if callable(self._row_height):
+            self._offsets = array('q', accumulate(map(self._row_height, range(self._row_count)), initial=0))
+        else:
+            self._offsets = _UniformOffsets(self._row_height, self._row_count)
+
+    def _resize_index(self, old_count:int):
+        """
+        Updates tops of rows after the amount of rows has changed from 'old_count', only tops of added or removed rows are computed
+        """
+        if not callable(self._row_height):
+            self._offsets.row_count = self._row_count
+
+        elif self._row_count > old_count:
+            tops = accumulate(map(self._row_height, range(old_count, self._row_count)), initial=self._offsets[-1])
+            # Skip the top of the first added row, it's already there
+            next(tops)
+            self._offsets.extend(tops)
+
+        else:
+            del self._offsets[self._row_count + 1:]
+
+    def _sync_rows(self):
+        """
+        Gives widgets to rows that came into view, takes them from rows that left it and moves the rest
+        """
+        if not self._rows_dirty:
+            return
+
+        self._rows_dirty = False
+        visible = self.visible_rows()
+
+        for index in [i for i in self._rows if i not in visible]:
+            widget = self._rows.pop(index)
+            self.delete_sub_object(widget)
+            self._free.append(widget)
+
+        offsets = self._offsets
+        for index in visible:
+            top = offsets[index] - self._scroll
+            widget = self._rows.get(index)
+
+            if widget is None:
+                widget = self._free.pop() if self._free else self.create_row()
+
+                with widget.batch():
+                    widget.placement = (0, top, self.width, offsets[index + 1] - offsets[index])
+                    self.update_row(widget, index)
+
+                self._rows[index] = widget
+                self.add_sub_object(widget)
+
+            elif widget.y != top:
+                widget.y = top
+
+    def _compose(self) -> list:
+        """
+        Moves content that stays in view, draws only rows that came into view and rows that have changed
+        """
+        if not self._converted:
+            self._convert()
+
+        # Rows that have changed by themselves, not by scrolling
+        changed = [widget for widget in self._rows.values() if widget._dirty]
+
+        self._sync_rows()
+
+        full_rect = pygame.Rect((0, 0), self.size)
+        dy = None if self._drawn_scroll is None else self._scroll - self._drawn_scroll
+
+        if self._dirty or dy is None or abs(dy) >= self.height:
+            self.surface.fill((0, 0, 0, 0))
+            self._draw_sub_objects(self._sub_objects)
+
+            regions = [full_rect]
+        else:
+            redraw = []
+
+            if dy:
+                self.surface.scroll(0, -dy)
+
+                # Strip that came into view
+                if dy > 0:
+                    redraw.append(pygame.Rect(0, self.height - dy, self.width, dy))
+                else:
+                    redraw.append(pygame.Rect(0, 0, self.width, -dy))
+
+            for widget in changed:
+                if widget._parent is self:
+                    bounds = widget.get_bounds()
+
+                    if widget._drawn_bounds is not None:
+                        bounds = bounds.union(widget._drawn_bounds.move(0, -dy))
+
+                    redraw.append(bounds)
+
+            if redraw:
+                self._redraw_regions(redraw)
+
+            # Scrolling has moved everything
+            regions = [full_rect] if dy else redraw
+
+        for widget in self._sub_objects:
+            widget._clean()
+
+        self._drawn_scroll = self._scroll
+        self._removed_regions = []
+        self._content_dirty = False
+        self._clean()
+
+        return regions
+
+    def _dirty_regions(self) -> list:
+        # Changed rows are found only when composing, redraw the whole list on parent surface
+        if self._content_dirty and not self._dirty:
+            return [self.get_bounds()]
+
+        return super()._dirty_regions()
+
+class CompactLabel(CompactUIObject):
+    __slots__ = ('font', '_font_size', 'font_color', 'alpha', '_text', '_surface', '_max_font', '_text_size', '_needs_layout', '_needs_render', '_fitted_size')
+
+    def __init__(self, placement:tuple, text:str, font_size:Optional[int]=None, font_color:tuple=(0, 0, 0), font:str="monospace", alpha:int=255):
+        self.font = font
+        self._font_size = font_size
+        self.font_color = font_color
+        self.alpha = alpha
+        self._text = text
+
+        # Text is measured and rendered only when it's needed
+        self._surface = None
+        self._max_font = None
+        self._text_size = (0, 0)
+        self._needs_layout = True
+        self._needs_render = True
+
+        # Label size for which the biggest possible font was found
+        self._fitted_size = None
+
+        super().__init__(placement)
+    
+    @property
+    def text(self) -> str:
+        return self._text
+    
+    @text.setter
+    def text(self, t:str):
+        self._text = t
+
+        self.reload_label()
+
+    @property
+    def font_size(self) -> int:
+        return self._font_size
+
+    @font_size.setter
+    def font_size(self, f:int):
+        self._font_size = f
+
+        self.reload_label()
+
+    @property
+    def label(self) -> Optional[pygame.Surface]:
+        """
+        Rendered text, it's rendered when it's needed for the first time
+        """
+        if self._needs_render:
+            self._render()
+
+        return self._surface
+
+    @property
+    def max_font(self) -> Optional[int]:
+        self._layout()
+
+        return self._max_font
+    
+    def get_width(self) -> int:
+        """
+        Gets actual width of text
+        """
+        self._layout()
+
+        return self._text_size[0]
+    
+    def get_height(self) -> int:
+        """
+        Gets actual height of text
+        """
+        self._layout()
+
+        return self._text_size[1]
+
+    def reload_label(self):
+        """
+        Reloads pygame label, text will be measured and rendered again when it's needed
+        """
+        self.mark_dirty()
+
+        self._needs_layout = True
+        self._needs_render = True
+
+    def _layout(self):
+        """
+        Finds font size and measures text without rendering it
+        """
+        if not self._needs_layout:
+            return
+
+        self._needs_layout = False
+
+        # If font is not specified find the biggest possible font
+        if self.font_size is None:
+            self._max_font = self._find_biggest_possible_font()
+            self._fitted_size = self.size
+
+            if self._max_font is None:
+                print("\033[91m Can't render label, too small space \033[0m")
+                self._text_size = (0, 0)
+                return
+
+            self._text_size = font_registry.get(self.font, self._max_font).size(f'{self.text}')
+            return
+        # Font specified, measure normal label
+        self._text_size = font_registry.get(self.font, self.font_size).size(f'{self.text}')
+
+    def _render(self):
+        """
+        Renders pygame label
+        """
+        self._layout()
+
+        self._needs_render = False
+
+        font_size = self._max_font if self.font_size is None else self.font_size
+
+        if font_size is None:
+            self._surface = None
+            return
+
+        self._surface = text_cache.render(*self._text_request())
+
+    def _text_request(self) -> Optional[tuple]:
+        self._layout()
+        font_size = self._max_font if self.font_size is None else self.font_size
+
+        if font_size is None:
+            return None
+
+        return (self.font, font_size, f'{self.text}', (*self.font_color, self.alpha/255))
+
+    def draw(self, surface):
+        """
+        Draws itself on a given surface
+        """
+        label = self.label
+
+        # Draw label
+        if label is not None:
+            surface.blit(label, self.position)
+
+    def _get_blits(self) -> list:
+        label = self.label
+
+        return [(label, self.position)] if label is not None else []
+
+    def _find_biggest_possible_font(self) -> Optional[int]:
+        """
+        Finds the biggest possible font for set text, height and width
+        """
+        text = f'{self.text}'
+        width, height = self.placement[2], self.placement[3]
+
+        # Sizes loaded from a snapshot don't need a search
+        size = _fitted_font_sizes.get((self.font, text, width, height))
+        if size is not None:
+            return size
+
+        return _fit_font_size(self.font, text, width, height)
+
+    @property
+    def current_font_size(self) -> int:
+        return self.max_font if self.font_size is None else self.font_size
+
+    def get_bounds(self) -> pygame.Rect:
+        """
+        Returns rectangle covering rendered text
+        """
+        return pygame.Rect(self.position, (self.get_width(), self.get_height()))
+
+    # ---- RELOAD LABEL AFTER CHAINING ITS SIZE ----
+    def _placement_changed(self):
+        super()._placement_changed()
+
+        # Only the biggest possible font depends on label size
+        if self.font_size is None and self.size != self._fitted_size:
+            self.reload_label()
+
+class Label(CompactLabel, UIObject):
+    pass
+
+class CompactButton(CompactUIObject):
+    __slots__ = ('label', '_label_pending', '_color', '_alpha', 'click_function')
+
+    # Class used to create a label
+    _label_class = CompactLabel
+
+    def __init__(self, placement:tuple, color:tuple, text:str, alpha:int=255, font_size:Optional[int]=None, font_color:tuple=(0, 0, 0), font:str="monospace", click_function:Optional[Callable]=None):
+        self.label = None
+        self._label_pending = False
+        super().__init__(placement)
+        self.color = color
+        self.alpha = alpha
+
+        lab_placement = (round(placement[0] + (placement[2]/8)), round(placement[1] + (placement[3]/8)), round(placement[2]* (3/4)), round(placement[3] * (3/4)))
+        self.label = self._label_class(lab_placement, text, font_size=font_size, font_color=font_color, alpha=alpha, font=font)
+        self.label._owner = self
+        # Make sure that label is centered
+        self.label.x = ((placement[2] - self.label.get_width())/2) + placement[0]
+        self.label.y = ((placement[3] - self.label.get_height())/2) + placement[1]
+
+        self.text = text
+        self.click_function = click_function
+
+    # ---- TEXT AND FONT ARE KEPT ONLY BY THE LABEL ----
+    @property
+    def text(self) -> str:
+        return self.label.text
+
+    @text.setter
+    def text(self, t:str):
+        # Render new label
+        self.label.text = t
+
+    @property
+    def font(self) -> str:
+        return self.label.font
+
+    @font.setter
+    def font(self, f:str):
+        self.label.font = f
+        self.label.reload_label()
+        self._adjust_label()
+
+    @property
+    def font_size(self) -> Optional[int]:
+        return self.label.font_size
+
+    @font_size.setter
+    def font_size(self, f:Optional[int]):
+        self.label.font_size = f
+        self._adjust_label()
+
+    @property
+    def font_color(self) -> tuple:
+        return self.label.font_color
+
+    @font_color.setter
+    def font_color(self, c:tuple):
+        self.label.font_color = c
+        self.label.reload_label()
+
+    @property
+    def color(self) -> tuple:
+        return self._color
+
+    @color.setter
+    def color(self, c:tuple):
+        self._color = c
+        self.mark_dirty()
+
+    @property
+    def alpha(self) -> int:
+        return self._alpha
+
+    @alpha.setter
+    def alpha(self, a:int):
+        self._alpha = a
+        if self.label is not None:
+            self.label.alpha = a
+
+        self.mark_dirty()
+
+    def draw(self, surface):
+        """
+        Draws itself on a given surface
+        """
+        # Draw button
+        pygame.draw.rect(surface, (*self.color, self.alpha), self.placement)
+        # Draw label
+        self.label.draw(surface)
+
+    def clicked(self, pos:tuple) -> bool:
+        """
+        Checks if button is clicked for given mouse position and runs specified 'click_function'
+        """
+        abs_x, abs_y = self.get_absolute_pos()
+
+        if pos[0] > abs_x and pos[0] < self.width + abs_x:
+            if pos[1] > abs_y and pos[1] < self.height + abs_y:
+                # If user speciefied small function execute it
+                if self.click_function is not None:
+                    self.click_function()
+
+                return True
+
+        return False
+    
+    def get_hit_rect(self) -> pygame.Rect:
+        """
+        Returns absolute rectangle in which button can be clicked
+        """
+        return pygame.Rect(self.get_absolute_pos(), self.size)
+
+    def get_bounds(self) -> pygame.Rect:
+        """
+        Returns rectangle covering button and its label
+        """
+        return pygame.Rect(self.placement).union(self.label.get_bounds())
+
+    # ---- RELOAD LABEL POSTION AFTER CHANGING POSITION OR SIZE ----
+    def _placement_changed(self):
+        super()._placement_changed()
+
+        if self._batch_depth:
+            self._label_pending = True
+        else:
+            self._adjust_label()
+
+    def _batched_parts(self) -> tuple:
+        return (self.label,) if self.label is not None else ()
+
+    def _flush_batch(self):
+        if self._label_pending:
+            self._label_pending = False
+            self._adjust_label()
+    
+    def _adjust_label(self):
+        """
+        Adjust label position after button size or placement has been changed
+        """
+        label = self.label
+
+        if label is not None:
+            # Change label size to calculate new max font etc., moving doesn't change it
+            size = (round(self.width* (3/4)), round(self.height * (3/4)))
+            if label.size != size:
+                label.size = size
+
+            # Update label position
+            label.position = (((self.width - label.get_width())/2) + self.x, ((self.height - label.get_height())/2) + self.y)
+
+class Button(CompactButton, UIObject):
+    _label_class = Label
+
+class CompactCheckbox(CompactUIObject):
+    __slots__ = ('label', '_label_pending', '_checkbox_color', '_indicator_color', 'alpha', 'spacing', 'click_function', '_checked')
+
+    # Class used to create a label
+    _label_class = CompactLabel
+
+    def __init__(self, placement:tuple, checkbox_color:tuple, indicator_color:tuple, text:str, spacing:Optional[int]=None, alpha:int=255, 
+                font:str="monospace", font_size:Optional[int]=None, font_color:tuple=(0, 0, 0), click_function:Optional[Callable]=None):
         self.label = None
+        self._label_pending = False
+        super().__init__(placement)
+        
+        self.checkbox_color = checkbox_color
+        self.indicator_color = indicator_color
+        self.alpha = alpha
+        self.spacing = spacing
+
+        # Just set a label and adjust its position later
+        lab_placement = (self.x + self.height, self.y, self.width - self.height - round(self.height/4), self.height - round(self.height/4))
+        self.label = self._label_class(lab_placement, text, font_size=font_size, font_color=font_color, alpha=alpha, font=font)
+        self.label._owner = self
+        
+        # Adjust labbel position
+        if self.spacing is not None:
+            self.label.x = self.x + self.height + self.spacing
+        else:
+            self.label.x = self.x + self.height + self._calculate_spacing()
+        
+        self.label.y = ((placement[3] - self.label.get_height())/2) + placement[1]
+
+        self.text = text
+        self.click_function = click_function
+        self.checked = False
+    
+    def _calculate_spacing(self) -> int:
+        """
+        Calculates spacing between label nad a box for set font size
+        """
+        return round(self.height/4) if round(self.height/4) > 1 else 1
+
+    # ---- TEXT AND FONT ARE KEPT ONLY BY THE LABEL ----
+    @property
+    def text(self) -> str:
+        return self.label.text
+
+    @text.setter
+    def text(self, t:str):
+        # Render new label
+        self.label.text = t
+
+    @property
+    def font(self) -> str:
+        return self.label.font
+
+    @font.setter
+    def font(self, f:str):
+        self.label.font = f
+        self.label.reload_label()
+        self._adjust_label()
+
+    @property
+    def font_size(self) -> Optional[int]:
+        return self.label.font_size
+
+    @font_size.setter
+    def font_size(self, f:Optional[int]):
+        self.label.font_size = f
+        self._adjust_label()
+
+    @property
+    def font_color(self) -> tuple:
+        return self.label.font_color
+
+    @font_color.setter
+    def font_color(self, c:tuple):
+        self.label.font_color = c
+        self.label.reload_label()
+
+    @property
+    def checked(self) -> bool:
+        return self._checked
+
+    @checked.setter
+    def checked(self, c:bool):
+        self._checked = c
+        self.mark_dirty()
+
+    @property
+    def checkbox_color(self) -> tuple:
+        return self._checkbox_color
+
+    @checkbox_color.setter
+    def checkbox_color(self, c:tuple):
+        self._checkbox_color = c
+        self.mark_dirty()
+
+    @property
+    def indicator_color(self) -> tuple:
+        return self._indicator_color
+
+    @indicator_color.setter
+    def indicator_color(self, c:tuple):
+        self._indicator_color = c
+        self.mark_dirty()
+
+    def draw(self, surface):
+        """
+        Draws itself on a given surface
+        """
+        # Draw box
+        pygame.draw.rect(surface, (*self.checkbox_color, self.alpha), (self.x, self.y, self.height, self.height))
+
+        # Draw checked indicator aka circle
+        if self.checked:
+            pygame.draw.circle(surface, self.indicator_color, (int(self.x + self.height/2), int(self.y + self.height/2)), int(self.height/4))
+
+        # Draw label
+        self.label.draw(surface)
+
+    def clicked(self, pos:tuple) -> bool:
+        """
+        Checks if checkbox is clicked for given mouse position and runs specified 'click_function'
+        """
+        abs_x, abs_y = self.get_absolute_pos()
+
+        if pos[0] > abs_x and pos[0] < self.height + abs_x:
+            if pos[1] > abs_y and pos[1] < self.height + abs_y:
+                # Unmark or mark 
+                self.checked = not self.checked
+
+                # If user speciefied small function execute it
+                if self.click_function is not None:
+                    self.click_function()
+
+                return True
+
+        return False
+    
+    def get_hit_rect(self) -> pygame.Rect:
+        """
+        Returns absolute rectangle in which checkbox can be clicked
+        """
+        return pygame.Rect(self.get_absolute_pos(), (self.height, self.height))
+
+    def get_bounds(self) -> pygame.Rect:
+        """
+        Returns rectangle covering box and label
+        """
+        return pygame.Rect(self.x, self.y, self.height, self.height).union(self.label.get_bounds())
+
+    # ---- RELOAD LABEL POSTION AFTER CHANGING POSITION OR SIZE ----
+    def _placement_changed(self):
+        super()._placement_changed()
+
+        if self._batch_depth:
+            self._label_pending = True
+        else:
+            self._adjust_label()
+
+    def _batched_parts(self) -> tuple:
+        return (self.label,) if self.label is not None else ()
+
+    def _flush_batch(self):
+        if self._label_pending:
+            self._label_pending = False
+            self._adjust_label()
+    
+    def _adjust_label(self):
+        """
+        Adjust label position after checkbox size or placement has been changed
+        """
+        label = self.label
+
+        if label is not None:
+            spacing = self.spacing if self.spacing is not None else self._calculate_spacing()
+
+            # Change label size to calculate new max font etc., moving doesn't change it
+            size = (self.width - self.height - spacing, self.height - int(self.height/4))
+            if label.size != size:
+                label.size = size
+
+            # Update label position
+            label.position = (self.x + self.height + spacing, ((self.height - label.get_height())/2) + self.y)
+
+class Checkbox(CompactCheckbox, UIObject):
+    _label_class = Label
+
+class CompactSlider(CompactUIObject):
+    __slots__ = ('_label_surface', '_label_width', '_label_height', '_label_pos_width', '_label_pos_height', '_label_pos_pending', 'font', 'font_size', 'font_color',
+                 '_slider_color', '_bar_color', 'alpha', '_text', 'spacing', 'click_function', '_min_value', '_max_value', '_jump', '_pixels_per_jump', '_round_to',
+                 'slider_radius', '_value')
+
+    def __init__(self, placement:tuple, min_value:Union[int, float], max_value:Union[int, float], jump:Union[int, float], default_value:Union[int, float], 
+                slider_color:tuple, bar_color:tuple, text:str, slider_radius:Optional[int]=None, spacing:int=10, alpha:int=255, 
+                font_size:int=10, font_color:tuple=(0, 0, 0), font:str="monospace", click_function:Optional[Callable]=None):
+        # Label is measured when value changes and rendered only when it's needed
+        # None until the label is rendered
+        self._label_surface = None
+        self._label_width = None
+        self._label_height = None
+        # Label size for which label position was computed, position changes only when it's reloaded
+        self._label_pos_width = None
+        self._label_pos_height = None
+        self._label_pos_pending = False
+
+        # Scale is computed when range, jump and width are known
+        self._min_value = None
+        self._max_value = None
+        self._jump = None
+        self._value = None
         super().__init__(placement)
         
         self.font = font
         self.font_size = font_size
         self.font_color = font_color
+        
+        self.slider_color = slider_color
+        self.bar_color = bar_color
+        self.alpha = alpha
+        self._text = text
+        self.spacing = spacing
+        self.click_function = click_function
+        self._min_value = min_value
+        self._max_value = max_value
+        self._jump = jump
+        self._update_scale()
+        self.slider_radius = slider_radius
+        self.value = default_value
+        
+        self.reload_label_pos()
+        
+        if self.placement[2] < (max_value - min_value)/jump:
+            raise ValueError("\033[91m Your total amout of jumps is greater than slider width, ex. you can't set slider width to 100, jump to 1 and max value to 200 because there should be at least 1 pixel per value. You can change jump to 2 to correct it \033[0m")
+
+    @property
+    def value(self) -> Union[int, float]:
+        return self._value
+
+    @value.setter
+    def value(self, v:Union[int, float]):
+        # Make sure it's not out of scale
+        if v > self.max_value:
+            v = self.max_value
+        elif v < self.min_value:
+            v = self.min_value
+        
+        # If the value is a whole number show it like '7' instead of '7.0'
+        if float(v).is_integer():
+            v = int(v)
+
+        # Value is the same, there is no need to measure label again
+        if v == self._value:
+            return
+
+        self._value = v
+
+        self._render_label()
+
+    @property
+    def min_value(self) -> Union[int, float]:
+        return self._min_value
+
+    @min_value.setter
+    def min_value(self, v:Union[int, float]):
+        self._min_value = v
+        self._update_scale()
+
+    @property
+    def max_value(self) -> Union[int, float]:
+        return self._max_value
+
+    @max_value.setter
+    def max_value(self, v:Union[int, float]):
+        self._max_value = v
+        self._update_scale()
+
+    @property
+    def jump(self) -> Union[int, float]:
+        return self._jump
+
+    @jump.setter
+    def jump(self, j:Union[int, float]):
+        self._jump = j
+        self._update_scale()
+
+    def _update_scale(self):
+        """
+        Precomputes how many pixels one jump takes and to how many decimal places values are rounded, called when range, jump or width changes
+        """
+        # Not initialized yet
+        if self._jump is None:
+            return
+
+        self._pixels_per_jump = self.width/((self._max_value - self._min_value)/self._jump)
+        self._round_to = abs(Decimal(str(self._jump)).as_tuple().exponent)
+
+        self.mark_dirty()
+
+    def value_to_pixel(self, value:Union[int, float]) -> int:
+        """
+        Returns x coordinate of a given value relative to the beginning of the bar
+        """
+        return int(self._pixels_per_jump*((value - self._min_value)/self._jump))
+
+    def pixel_to_value(self, distance:Union[int, float]) -> Union[int, float]:
+        """
+        Returns value for given distance from the beginning of the bar, rounded to jumps but not limited to min and max value
+        """
+        return round(round(distance/self._pixels_per_jump, self._round_to)*self._jump, self._round_to) + self._min_value
+
+    @property
+    def text(self) -> str:
+        return self._text
+
+    @text.setter
+    def text(self, t:str):
+        self._text = t
+
+        self._render_label()
+
+    @property
+    def label(self) -> pygame.Surface:
+        """
+        Rendered label, it's rendered when it's needed for the first time
+        """
+        if self._label_surface is None:
+            self._label_surface = text_cache.render(*self._text_request())
+
+        return self._label_surface
+
+    def _text_request(self) -> Optional[tuple]:
+        return (self.font, self.font_size, f'{self.text}: {self.value}', (*self.font_color, self.alpha))
+
+    def _render_label(self):
+        """
+        Measures label with current text and value, it will be rendered when it's needed
+        """
+        self.mark_dirty()
+
+        self._label_width, self._label_height = font_registry.get(self.font, self.font_size).size(f'{self.text}: {self.value}')
+        self._label_surface = None
+
+    def reload_label_pos(self):
+        """
+        Reloads label position
+        """
+        if self._label_width is not None:
+            self._label_pos_width = self._label_width
+            self._label_pos_height = self._label_height
+
+    @property
+    def label_pos(self) -> Optional[tuple]:
+        """
+        Position of the label centered under the bar, computed for the label size from the last 'reload_label_pos'
+        """
+        if self._label_pos_width is None:
+            return None
+
+        if self.slider_radius is not None:
+            return (self.x + (self.width/2 - self._label_pos_width/2), self.y + self.slider_radius*2 + self._label_pos_height/2)
+
+        return (self.x + (self.width/2 - self._label_pos_width/2), self.y + self.height*2 + self._label_pos_height/2)
+
+    @property
+    def slider_color(self) -> tuple:
+        return self._slider_color
+
+    @slider_color.setter
+    def slider_color(self, c:tuple):
+        self._slider_color = c
+        self.mark_dirty()
+
+    @property
+    def bar_color(self) -> tuple:
+        return self._bar_color
+
+    @bar_color.setter
+    def bar_color(self, c:tuple):
+        self._bar_color = c
+        self.mark_dirty()
+
+    def draw(self, surface):
+        """
+        Draws itself on a given surface
+        """
+        # Draw a bar
+        pygame.draw.rect(surface, (*self.bar_color, self.alpha), self.placement)
+
+        #Draw slider
+        center = (int(self._pixels_per_jump*((self._value - self._min_value)/self._jump) + self._x), int(self._y + self._height/2))
+        if self.slider_radius is not None:
+            pygame.draw.circle(surface, self.slider_color, center, self.slider_radius)
+        else:
+            pygame.draw.circle(surface, self.slider_color, center, self.height)
+        
+        # Draw label
+        surface.blit(self.label, self.label_pos)
+
+    def clicked(self, pos:tuple) -> bool:
+        """
+        Checks if slider is clicked for given mouse position, updates its value and runs specified 'click_function'
+        """
+
+        if self.slider_radius is not None:
+            radius = self.slider_radius
+        else:
+            radius = self.height
+
+        abs_x, abs_y = self.get_absolute_pos()
+
+        if pos[0] + radius > abs_x and pos[0] - radius < self.width + abs_x:
+            if pos[1] + radius > abs_y and pos[1] - radius < self.height + abs_y:
+                self.drag(pos)
+
+                return True
+
+        return False
+
+    def drag(self, pos:tuple) -> bool:
+        """
+        Moves slider to given mouse position without checking if it's over the slider, used while the pointer is captured.
+        Runs 'click_function' and returns True only when value has changed
+        """
+        old_value = self._value
+        self.value = self.pixel_to_value(pos[0] - self.get_absolute_pos()[0])
+
+        if self._value == old_value:
+            return False
+
+        # If user speciefied small function execute it, but only when value has changed
+        if self.click_function is not None:
+            self.click_function()
+
+        return True
+    
+    def get_hit_rect(self) -> pygame.Rect:
+        """
+        Returns absolute rectangle in which slider can be clicked
+        """
+        radius = self.slider_radius if self.slider_radius is not None else self.height
+
+        return pygame.Rect(self.get_absolute_pos(), self.size).inflate(radius*2, radius*2)
+
+    def get_bounds(self) -> pygame.Rect:
+        """
+        Returns rectangle covering bar, slider circle at any position and label
+        """
+        radius = self.slider_radius if self.slider_radius is not None else self.height
+        bounds = pygame.Rect(self.x - radius, self.y + self.height/2 - radius, self.width + radius*2 + 1, radius*2 + 1)
+
+        return bounds.union(pygame.Rect(self.placement)).union(pygame.Rect(self.label_pos, (self._label_width, self._label_height)))
+
+    # ---- RELOAD LABEL POSTION AFTER CHANGING POSITION OR SIZE ----
+    def _placement_changed(self):
+        super()._placement_changed()
+
+        self._update_scale()
+
+        if self._batch_depth:
+            self._label_pos_pending = True
+        else:
+            self.reload_label_pos()
+
+    def _flush_batch(self):
+        if self._label_pos_pending:
+            self._label_pos_pending = False
+            self.reload_label_pos()
+
+class Slider(CompactSlider, UIObject):
+    pass
+
+class WidgetBatch(UIObject):
+    """
+    Draws many widgets of the same kind and size at once. Positions and states are kept in arrays, shared parts are rendered once
+    and the whole batch is drawn with a single 'Surface.blits' call
+    """
+    def __init__(self, placement:tuple, item_size:tuple, font:str="monospace", font_size:Optional[int]=None, font_color:tuple=(0, 0, 0), alpha:int=255, click_function:Optional[Callable]=None):
+        # Item positions relative to the batch
+        self._xs = array('i')
+        self._ys = array('i')
+        self._texts = []
+        # Rendered label and its offset from item position, None until needed
+        self._labels = []
+
+        # Prepared (surface, position) pairs for 'blits', None when something has changed
+        self._sequence = None
+
+        super().__init__(placement)
+
+        self._item_width, self._item_height = item_size
+        self.font = font
+        self.font_size = font_size
+        self.font_color = font_color
+        self.alpha = alpha
+        self.click_function = click_function
+
+        # Index of the last clicked item
+        self.clicked_index = None
+
+        self._create_sprites()
+
+    def __len__(self) -> int:
+        return len(self._xs)
+
+    def add(self, position:tuple, text:str) -> int:
+        """
+        Adds an item at given position relative to the batch, returns its index
+        """
+        self._xs.append(int(position[0]))
+        self._ys.append(int(position[1]))
+        self._texts.append(text)
+        self._labels.append(None)
+
+        self._changed()
+
+        return len(self._xs) - 1
+
+    def remove(self, index:int):
+        """
+        Removes an item, items after it move one index down
+        """
+        del self._xs[index]
+        del self._ys[index]
+        del self._texts[index]
+        del self._labels[index]
+
+        self._changed()
+
+    def get_position(self, index:int) -> tuple:
+        return (self._xs[index], self._ys[index])
+
+    def set_position(self, index:int, position:tuple):
+        self._xs[index] = int(position[0])
+        self._ys[index] = int(position[1])
+
+        self._changed()
+
+    def get_text(self, index:int) -> str:
+        return self._texts[index]
+
+    def set_text(self, index:int, text:str):
+        self._texts[index] = text
+        self._labels[index] = None
+
+        self._changed()
+
+    def draw(self, surface):
+        """
+        Draws all items on a given surface
+        """
+        if self._sequence is None:
+            self._sequence = self._build_sequence()
+
+        surface.blits(self._sequence, doreturn=False)
+
+    def _get_blits(self) -> list:
+        if self._sequence is None:
+            self._sequence = self._build_sequence()
+
+        return self._sequence
+
+    def clicked(self, pos:tuple) -> bool:
+        """
+        Checks if any item is clicked for given mouse position, remembers its index in 'clicked_index' and runs 'click_function' with that index
+        """
+        abs_x, abs_y = self.get_absolute_pos()
+        x, y = pos[0] - abs_x, pos[1] - abs_y
+        hit_width, hit_height = self._hit_size()
+
+        # Items drawn later are on top
+        for index in range(len(self._xs) - 1, -1, -1):
+            item_x = self._xs[index]
+            item_y = self._ys[index]
+
+            if x > item_x and x < item_x + hit_width and y > item_y and y < item_y + hit_height:
+                self.clicked_index = index
+                self._item_clicked(index)
+
+                # If user speciefied small function execute it
+                if self.click_function is not None:
+                    self.click_function(index)
+
+                return True
+
+        return False
+
+    def get_hit_rect(self) -> pygame.Rect:
+        return pygame.Rect(self.get_absolute_pos(), self.size)
+
+    def _changed(self):
+        """
+        Forgets prepared blits so they will be prepared again when drawing
+        """
+        self._sequence = None
+        self.mark_dirty()
+
+    def _placement_changed(self):
+        super()._placement_changed()
+
+        self._sequence = None
+
+    def _label(self, index:int) -> tuple:
+        """
+        Returns rendered label of an item and its offset from item position
+        """
+        label = self._labels[index]
+
+        if label is None:
+            label = self._render_label(self._texts[index])
+            self._labels[index] = label
+
+        return label
+
+    def _render_label(self, text:str) -> tuple:
+        """
+        Renders label that fits given size and returns it with its offset, override it to place label
+        """
+        return (None, (0, 0))
+
+    def _fit_label(self, text:str, width:int, height:int) -> Optional[pygame.Surface]:
+        """
+        Renders label with set font size or the biggest font that fits given size
+        """
+        font_size = self.font_size if self.font_size is not None else _fit_font_size(self.font, text, width, height)
+
+        if font_size is None:
+            return None
+
+        return text_cache.render(self.font, font_size, text, (*self.font_color, self.alpha/255))
+
+    def _build_sequence(self) -> list:
+        """
+        Prepares (surface, position) pairs of all items for 'blits'
+        """
+        return []
+
+    def _create_sprites(self):
+        """
+        Renders parts shared by all items
+        """
+        pass
+
+    def _hit_size(self) -> tuple:
+        """
+        Returns size of clickable area of an item
+        """
+        return (self._item_width, self._item_height)
+
+    def _item_clicked(self, index:int):
+        """
+        Called when an item has been clicked
+        """
+        pass
+
+class CheckboxBatch(WidgetBatch):
+    """
+    Batch of checkboxes of the same size and colors
+    """
+    def __init__(self, placement:tuple, item_size:tuple, checkbox_color:tuple, indicator_color:tuple, spacing:Optional[int]=None, alpha:int=255,
+                font:str="monospace", font_size:Optional[int]=None, font_color:tuple=(0, 0, 0), click_function:Optional[Callable]=None):
+        self._checked = bytearray()
         self.checkbox_color = checkbox_color
         self.indicator_color = indicator_color
-        self.alpha = alpha
         self.spacing = spacing
 
-        # Just set a label and adjust its position later
-        lab_placement = (self.x + self.height, self.y, self.width - self.height - round(self.height/4), self.height - round(self.height/4))
-        self.label = Label(lab_placement, text, font_size=font_size, font_color=font_color, alpha=alpha, font=font)
-        
-        # Adjust labbel position
+        super().__init__(placement, item_size, font=font, font_size=font_size, font_color=font_color, alpha=alpha, click_function=click_function)
+
+    def add(self, position:tuple, text:str, checked:bool=False) -> int:
+        self._checked.append(checked)
+
+        return super().add(position, text)
+
+    def remove(self, index:int):
+        del self._checked[index]
+
+        super().remove(index)
+
+    def is_checked(self, index:int) -> bool:
+        return bool(self._checked[index])
+
+    def set_checked(self, index:int, checked:bool):
+        self._checked[index] = checked
+
+        self._changed()
+
+    def _item_clicked(self, index:int):
+        # Unmark or mark
+        self.set_checked(index, not self._checked[index])
+
+    def _hit_size(self) -> tuple:
+        return (self._item_height, self._item_height)
+
+    def _spacing(self) -> int:
         if self.spacing is not None:
-            self.label.x = self.x + self.height + self.spacing
+            return self.spacing
+
+        return round(self._item_height/4) if round(self._item_height/4) > 1 else 1
+
+    def _create_sprites(self):
+        size = self._item_height
+
+        self._box = pygame.Surface((size, size), pygame.SRCALPHA)
+        self._box.fill((*self.checkbox_color, self.alpha))
+
+        self._checked_box = self._box.copy()
+        pygame.draw.circle(self._checked_box, self.indicator_color, (int(size/2), int(size/2)), int(size/4))
+
+    def _render_label(self, text:str) -> tuple:
+        width, height = self._item_width, self._item_height
+        label = self._fit_label(text, width - height - self._spacing(), height - int(height/4))
+
+        if label is None:
+            return (None, (0, 0))
+
+        return (label, (height + self._spacing(), (height - label.get_height())/2))
+
+    def _build_sequence(self) -> list:
+        sequence = []
+        x, y = self.x, self.y
+
+        for index in range(len(self._xs)):
+            item_x = self._xs[index] + x
+            item_y = self._ys[index] + y
+
+            sequence.append((self._checked_box if self._checked[index] else self._box, (item_x, item_y)))
+
+            label, (offset_x, offset_y) = self._label(index)
+            if label is not None:
+                sequence.append((label, (item_x + offset_x, item_y + offset_y)))
+
+        return sequence
+
+class ButtonBatch(WidgetBatch):
+    """
+    Batch of buttons of the same size and color
+    """
+    def __init__(self, placement:tuple, item_size:tuple, color:tuple, alpha:int=255, font_size:Optional[int]=None, font_color:tuple=(0, 0, 0), 
+                font:str="monospace", click_function:Optional[Callable]=None):
+        self.color = color
+
+        super().__init__(placement, item_size, font=font, font_size=font_size, font_color=font_color, alpha=alpha, click_function=click_function)
+
+    def _create_sprites(self):
+        self._button = pygame.Surface((self._item_width, self._item_height), pygame.SRCALPHA)
+        self._button.fill((*self.color, self.alpha))
+
+    def _render_label(self, text:str) -> tuple:
+        width, height = self._item_width, self._item_height
+        label = self._fit_label(text, round(width * (3/4)), round(height * (3/4)))
+
+        if label is None:
+            return (None, (0, 0))
+
+        # Center label
+        return (label, ((width - label.get_width())/2, (height - label.get_height())/2))
+
+    def _build_sequence(self) -> list:
+        sequence = []
+        x, y = self.x, self.y
+
+        for index in range(len(self._xs)):
+            item_x = self._xs[index] + x
+            item_y = self._ys[index] + y
+
+            sequence.append((self._button, (item_x, item_y)))
+
+            label, (offset_x, offset_y) = self._label(index)
+            if label is not None:
+                sequence.append((label, (item_x + offset_x, item_y + offset_y)))
+
+        return sequence
+
+class UIEvent():
+    """
+    Pygame event travelling through UI objects, attributes of the pygame event like 'pos', 'button' or 'key' are available directly
+    """
+    # Phases
+    CAPTURE = 1
+    TARGET = 2
+    BUBBLE = 3
+
+    def __init__(self, event, target:Optional[UIObject]=None):
+        self.event = event
+        self.type = event.type
+
+        # Object the event is aimed at and object whose listeners are currently called
+        self.target = target
+        self.current_target = None
+        self.phase = None
+
+        self.consumed = False
+
+    def __getattr__(self, name:str):
+        return getattr(self.event, name)
+
+    def consume(self):
+        """
+        Stops the event, no other listeners get it and UIManager doesn't pass it to widgets
+        """
+        self.consumed = True
+
+class UIManager():
+    """
+    Keeps placeholders, backgrounds and other UI objects, indexes absolute areas of clickable objects in a grid and passes mouse clicks only to the topmost object under the pointer
+    """
+    def __init__(self, cell_size:int=64):
+        self.cell_size = cell_size
+
+        self._objects = []
+
+        # Grid cell -> clickable objects touching it
+        self._grid = {}
+        # Clickable object -> grid cells it's indexed in
+        self._indexed = {}
+        # Object -> its drawing order, objects drawn later are on top
+        self._order = {}
+
+        self._tree_dirty = True
+
+        # Object that gets all mouse motion until the button is released, ex. dragged slider
+        self._captured = None
+        # Latest pointer position not yet passed to the captured object
+        self._pending_motion = None
+
+        # Object getting events that have no position, ex. key presses
+        self.focus = None
+
+    @property
+    def captured(self) -> Optional[UIObject]:
+        """
+        Object that currently captures the pointer or None
+        """
+        return self._captured
+
+    def add(self, obj:Type[CompactUIObject]):
+        """
+        Adds given object and all its sub objects to the manager
+        """
+        self._objects.append(obj)
+        self._tree_changed()
+
+    def remove(self, obj:Type[CompactUIObject]):
+        """
+        Removes given object and all its sub objects from the manager
+        """
+        self._objects.remove(obj)
+        self._tree_changed()
+
+        for o in self._walk(obj):
+            if o is self._captured:
+                self.release()
+            if o is self.focus:
+                self.focus = None
+
+    def draw(self, surface) -> list:
+        """
+        Draws all objects on a given surface in order they were added, returns list of changed rectangles
+        """
+        # Apply pointer motion gathered since the last frame
+        self.apply_motion()
+
+        changed = []
+
+        for obj in self._objects:
+            rects = obj.draw(surface)
+
+            if rects is None:
+                rects = [obj.get_bounds()]
+
+            changed.extend(rects)
+
+        return changed
+
+    def object_at(self, pos:tuple) -> Optional[UIObject]:
+        """
+        Returns the topmost clickable object for given position or None if there is nothing
+        """
+        candidates = self._candidates_at(pos)
+
+        return candidates[0] if candidates else None
+
+    def handle_event(self, event) -> Optional[UIObject]:
+        """
+        Passes mouse click to the topmost object under the pointer, returns object that has been clicked or None.
+        Clicked objects that can be dragged capture the pointer, motion is then passed only to them until the button is released
+        """
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            for obj in self._candidates_at(event.pos):
+                if obj.clicked(event.pos):
+                    if hasattr(obj, 'drag'):
+                        self._captured = obj
+                        self._pending_motion = None
+
+                    return obj
+
+        elif event.type == pygame.MOUSEMOTION and self._captured is not None:
+            # Only the latest position matters, it's applied once per frame
+            self._pending_motion = event.pos
+
+            return self._captured
+
+        elif event.type == pygame.MOUSEBUTTONUP and self._captured is not None:
+            obj = self._captured
+            self._pending_motion = event.pos
+            self.apply_motion()
+            self.release()
+
+            return obj
+
+        return None
+
+    def handle_events(self, events:list) -> list:
+        """
+        Handles all given events and applies pointer motion once, returns objects that have been clicked
+        """
+        clicked = []
+
+        for event in events:
+            obj = self.handle_event(event)
+
+            if obj is not None and event.type == pygame.MOUSEBUTTONDOWN:
+                clicked.append(obj)
+
+        self.apply_motion()
+
+        return clicked
+
+    def process_events(self, events:Optional[list]=None) -> list:
+        """
+        Reads pygame event queue once, or takes given events, routes every event through listeners and passes events that weren't consumed
+        to widgets like 'handle_event' does. Returns events that weren't consumed by listeners or widgets, ex. pygame.QUIT
+        """
+        if events is None:
+            events = pygame.event.get()
+
+        left = []
+
+        for event in events:
+            if self.dispatch(event):
+                continue
+
+            if self.handle_event(event) is None:
+                left.append(event)
+
+        self.apply_motion()
+
+        return left
+
+    def dispatch(self, event) -> bool:
+        """
+        Routes event through listeners of objects, returns True if it has been consumed.
+        Events with position go from the top container down to the topmost object under the pointer (capture) and back up (bubble),
+        other events go to the 'focus' object the same way or, when nothing is focused, to every object listening to them.
+        Subtrees without listeners for the event type are skipped
+        """
+        if not any(root._listener_counts and event.type in root._listener_counts for root in self._objects):
+            return False
+
+        pos = getattr(event, 'pos', None)
+
+        if pos is not None:
+            path = self._path_at(pos, event.type)
+        elif self.focus is not None:
+            path = self._path_to(self.focus)
         else:
-            self.label.x = self.x + self.height + self._calculate_spacing()
-        
-        self.label.y = ((placement[3] - self.label.get_height())/2) + placement[1]
+            ui_event = UIEvent(event)
 
-        self.text = text
-        self.click_function = click_function
-        self.checked = False
-    
-    def _calculate_spacing(self) -> int:
+            for root in self._objects:
+                if self._broadcast(root, ui_event):
+                    return True
+
+            return False
+
+        if not path:
+            return False
+
+        ui_event = UIEvent(event, path[-1])
+
+        for obj in path[:-1]:
+            if self._call_listeners(obj, ui_event, UIEvent.CAPTURE):
+                return True
+
+        if self._call_listeners(path[-1], ui_event, UIEvent.TARGET):
+            return True
+
+        for obj in reversed(path[:-1]):
+            if self._call_listeners(obj, ui_event, UIEvent.BUBBLE):
+                return True
+
+        return False
+
+    def _path_at(self, pos:tuple, event_type:int) -> list:
+        """
+        Returns objects from the top container to the topmost object under the pointer, doesn't go into objects without listeners for given type
+        """
+        path = []
+        sub_objects = self._objects
+
+        while True:
+            for obj in reversed(sub_objects):
+                if self._contains(obj, pos):
+                    break
+            else:
+                return path
+
+            path.append(obj)
+
+            # Nothing below is listening
+            if not obj._listener_counts or event_type not in obj._listener_counts:
+                return path
+
+            sub_objects = getattr(obj, '_sub_objects', ())
+
+    @staticmethod
+    def _path_to(obj:Type[CompactUIObject]) -> list:
         """
-        Calculates spacing between label nad a box for set font size
+        Returns objects from the top container to the given object
         """
-        return round(self.height/4) if round(self.height/4) > 1 else 1
+        path = []
+        while obj is not None:
+            path.append(obj)
+            obj = obj._parent
 
-    @property
-    def text(self) -> str:
-        return self._text
+        path.reverse()
 
-    @text.setter
-    def text(self, t:str):
-        # Render new label
-        self._text = t
+        return path
 
-        if not self.label is None:
-            self.label.text = t
+    @staticmethod
+    def _contains(obj:Type[CompactUIObject], pos:tuple) -> bool:
+        """
+        Checks if given absolute position is inside of an object
+        """
+        if hasattr(obj, 'get_hit_rect'):
+            return obj.get_hit_rect().collidepoint(pos)
 
-    def draw(self, surface):
+        return pygame.Rect(obj.get_absolute_pos(), obj.size).collidepoint(pos)
+
+    def _broadcast(self, obj:Type[CompactUIObject], ui_event:UIEvent) -> bool:
         """
-        Draws itself on a given surface
+        Calls listeners of given object and its sub objects in drawing order, returns True if event has been consumed
         """
-        # Draw box
-        pygame.draw.rect(surface, (*self.checkbox_color, self.alpha), (self.x, self.y, self.height, self.height))
+        if not obj._listener_counts or ui_event.type not in obj._listener_counts:
+            return False
 
-        # Draw checked indicator aka circle
-        if self.checked:
-            pygame.draw.circle(surface, self.indicator_color, (int(self.x + self.height/2), int(self.y + self.height/2)), int(self.height/4))
+        ui_event.target = obj
+        if self._call_listeners(obj, ui_event, UIEvent.TARGET):
+            return True
 
-        # Draw label
-        self.label.draw(surface)
+        for sub_obj in getattr(obj, '_sub_objects', ()):
+            if self._broadcast(sub_obj, ui_event):
+                return True
 
-    def clicked(self, pos:tuple) -> bool:
+        return False
+
+    @staticmethod
+    def _call_listeners(obj:Type[CompactUIObject], ui_event:UIEvent, phase:int) -> bool:
         """
-        Checks if checkbox is clicked for given mouse position and runs specified 'click_function'
+        Calls listeners of given object for the phase, capturing listeners in capture phase, others in bubble phase and all at the target.
+        Returns True if event has been consumed
         """
-        if pos[0] > self.get_absolute_pos()[0] and pos[0] < self.height + self.get_absolute_pos()[0]:
-            if pos[1] > self.get_absolute_pos()[1]  and pos[1] < self.height + self.get_absolute_pos()[1] :
-                # Unmark or mark 
-                self.checked = not self.checked
+        if obj._listeners is None or ui_event.type not in obj._listeners:
+            return False
 
-                # If user speciefied small function execute it
-                if self.click_function is not None:
-                    self.click_function()
+        ui_event.current_target = obj
+        ui_event.phase = phase
 
-                return True
+        # Copy, listeners may remove themselves
+        for listener, capture in tuple(obj._listeners[ui_event.type]):
+            if phase == UIEvent.TARGET or capture == (phase == UIEvent.CAPTURE):
+                if listener(ui_event):
+                    ui_event.consume()
+
+                if ui_event.consumed:
+                    return True
 
         return False
-    
-    # ---- OVERRING POSITION AND SIZE SETTER TO RELOAD LABEL POSTION AFTER ----
-    @property
-    def placement(self) -> tuple:
-        return self._placement
 
-    @placement.setter
-    def placement(self, p:tuple):
-        self._placement = p
+    def apply_motion(self) -> bool:
+        """
+        Passes the latest pointer position to the captured object, returns True if the object has changed.
+        It's called by 'draw', call it yourself if you don't draw through the manager
+        """
+        if self._captured is None or self._pending_motion is None:
+            return False
 
-        self._adjust_label()
-    
-    def _adjust_label(self):
+        pos, self._pending_motion = self._pending_motion, None
+
+        return self._captured.drag(pos)
+
+    def release(self):
         """
-        Adjust label position after checkbox size or placement has been changed
+        Ends pointer capture without applying pending motion
         """
-        if not self.label is None:
-            if self.spacing is not None:
-                # Change label size to calculate new max font etc.
-                self.label.size = (self.width - self.height - self.spacing, self.height - int(self.height/4))
-                self.label.reload_label()
+        self._captured = None
+        self._pending_motion = None
 
-                # Update label position
-                self.label.position = (self.x + self.height + self.spacing, ((self.placement[3] - self.label.get_height())/2) + self.placement[1])
-            
-            else:
-                # Change label size to calculate new max font etc.
-                self.label.size = (self.width - self.height - self._calculate_spacing(), self.height - int(self.height/4))
-                self.label.reload_label()
+    def _candidates_at(self, pos:tuple) -> list:
+        """
+        Returns clickable objects which area contains given position, the topmost first
+        """
+        self._rebuild()
 
-                # Update label position
-                self.label.position = (self.x + self.height + self._calculate_spacing(), ((self.placement[3] - self.label.get_height())/2) + self.placement[1])
+        cell = (int(pos[0] // self.cell_size), int(pos[1] // self.cell_size))
+        candidates = [obj for obj in self._grid.get(cell, ()) if obj.get_hit_rect().collidepoint(pos)]
+        candidates.sort(key=self._order.__getitem__, reverse=True)
 
-class Slider(UIObject):
-    def __init__(self, placement:tuple, min_value:Union[int, float], max_value:Union[int, float], jump:Union[int, float], default_value:Union[int, float], 
-                slider_color:tuple, bar_color:tuple, text:str, slider_radius:Optional[int]=None, spacing:int=10, alpha:int=255, 
-                font_size:int=10, font_color:tuple=(0, 0, 0), font:str="monospace", click_function:Optional[Callable]=None):
-        self.label = None
-        super().__init__(placement)
-        
-        self.font = font
-        self.font_size = font_size
-        self.font_color = font_color
-        
-        self.slider_color = slider_color
-        self.bar_color = bar_color
-        self.alpha = alpha
-        self.text = text
-        self.spacing = spacing
-        self.click_function = click_function
-        self.min_value = min_value
-        self.max_value = max_value
-        self.jump = jump
-        self.slider_radius = slider_radius
-        self.value = default_value
-        
-        if self.slider_radius is not None:
-            self.label_pos = (self.x + (self.width/2 - self.label.get_width()/2), self.y + self.slider_radius*2 + self.label.get_height()/2)
-        else:
-            self.label_pos = (self.x + (self.width/2 - self.label.get_width()/2), self.y + self.height*2 + self.label.get_height()/2)
-        
-        if self.placement[2] < (max_value - min_value)/jump:
-            raise ValueError("\033[91m Your total amout of jumps is greater than slider width, ex. you can't set slider width to 100, jump to 1 and max value to 200 because there should be at least 1 pixel per value. You can change jump to 2 to correct it \033[0m")
+        return candidates
 
-    @property
-    def value(self) -> Union[int, float]:
-        return self._value
+    def _tree_changed(self):
+        """
+        Called when objects were added or deleted, index will be rebuilt when needed
+        """
+        self._tree_dirty = True
 
-    @value.setter
-    def value(self, v:Union[int, float]):
-        # Make sure it's not out of scale
-        if v > self.max_value:
-            v = self.max_value
-        elif v < self.min_value:
-            v = self.min_value
-        
-        # If the value is a whole number show it like '7' instead of '7.0'
-        if float(v).is_integer():
-            self._value = int(v)
-        else:
-            self._value = v
+    def _object_moved(self, obj:Type[CompactUIObject]):
+        """
+        Called when object placement has been changed, updates index of that object and its sub objects
+        """
+        # Whole index will be rebuilt anyway
+        if self._tree_dirty:
+            return
 
-        # Render new label
-        self.label = pygame.font.SysFont(self.font, self.font_size).render(f'{self.text}: {self.value}', 1, (*self.font_color, self.alpha))
+        for o in self._walk(obj):
+            if o in self._order:
+                self._index(o)
 
-    def reload_label_pos(self):
+    def _rebuild(self):
         """
-        Reloads label position
+        Rebuilds the whole index if objects were added or deleted
         """
-        if self.label is not None:
-            if self.slider_radius is not None:
-                self.label_pos = (self.x + (self.width/2 - self.label.get_width()/2), self.y + self.slider_radius*2 + self.label.get_height()/2)
-            else:
-                self.label_pos = (self.x + (self.width/2 - self.label.get_width()/2), self.y + self.height*2 + self.label.get_height()/2)
+        if not self._tree_dirty:
+            return
 
-    def draw(self, surface):
+        for obj in self._order:
+            obj._manager = None
+
+        self._grid = {}
+        self._indexed = {}
+        self._order = {}
+
+        for root in self._objects:
+            # Sub objects find manager through their top container
+            root._manager = self
+
+            for obj in self._walk(root):
+                self._order[obj] = len(self._order)
+
+                self._index(obj)
+
+        self._tree_dirty = False
+
+    def _index(self, obj:Type[CompactUIObject]):
         """
-        Draws itself on a given surface
+        Puts clickable object in all grid cells that its area touches
         """
-        # Draw a bar
-        pygame.draw.rect(surface, (*self.bar_color, self.alpha), self.placement)
+        if not hasattr(obj, 'clicked'):
+            return
 
-        #Draw slider
-        pixels_per_one_jump = (self.placement[2]/((self.max_value - self.min_value)/self.jump))
-        center = (int(pixels_per_one_jump*((self.value-self.min_value)/self.jump)+self.placement[0]), int(self.placement[1] + self.placement[3]/2))
-        if self.slider_radius is not None:
-            pygame.draw.circle(surface, self.slider_color, center, self.slider_radius)
-        else:
-            pygame.draw.circle(surface, self.slider_color, center, self.height)
-        
-        # Draw label
-        surface.blit(self.label, self.label_pos)
+        for cell in self._indexed.pop(obj, ()):
+            self._grid[cell].discard(obj)
 
-    def clicked(self, pos:tuple) -> bool:
+        rect = obj.get_hit_rect()
+        cells = [(x, y) for x in range(rect.left // self.cell_size, (rect.right - 1) // self.cell_size + 1)
+                        for y in range(rect.top // self.cell_size, (rect.bottom - 1) // self.cell_size + 1)]
+
+        for cell in cells:
+            self._grid.setdefault(cell, set()).add(obj)
+
+        self._indexed[obj] = cells
+
+    @staticmethod
+    def _walk(obj:Type[CompactUIObject]):
         """
-        Checks if slider is clicked for given mouse position, updates its value and runs specified 'click_function'
+        Yields given object and all its sub objects in drawing order
         """
+        yield obj
 
-        if self.slider_radius is not None:
-            radius = self.slider_radius
-        else:
-            radius = self.height
+        for sub_obj in getattr(obj, '_sub_objects', ()):
+            yield from UIManager._walk(sub_obj)
 
-        if pos[0] + radius > self.get_absolute_pos()[0] and pos[0] - radius < self.width + self.get_absolute_pos()[0]:
-            if pos[1] + radius > self.get_absolute_pos()[1]  and pos[1] - radius  < self.height + self.get_absolute_pos()[1] :
-                # Set new value
-                bar_x_pos = self.get_absolute_pos()[0]
-                distance = pos[0] - bar_x_pos
-                pixels_per_one_jump = (self.placement[2]/((self.max_value - self.min_value)/self.jump))
-                round_to = abs(Decimal(str(self.jump)).as_tuple().exponent)
-                new_value = round(round(distance/pixels_per_one_jump, round_to)*self.jump, round_to) + self.min_value
+class Profiler():
+    """
+    Opt-in timing of drawing, clicking and label rendering of all UI classes. Timings are gathered per frame, aggregated per class
+    and per widget over the last 'window' frames, can be shown in an overlay and exported to JSON or CSV
+    """
+    # Methods and properties that are timed when they are defined by a class
+    METHODS = ('draw', 'clicked', 'drag', 'reload_label', 'label', '_render', '_render_label', '_compose', '_draw_sub_objects')
 
-                self.value = new_value
+    def __init__(self, window:int=120):
+        self.window = window
+        self.enabled = False
+        self.overlay_visible = False
 
-                # If user speciefied small function execute it
-                if self.click_function is not None:
-                    self.click_function()
+        # (class, attribute name, original attribute) replaced while profiler is enabled
+        self._originals = []
 
-                return True
+        # Finished frames, every frame is (duration, {(class name, widget name, method): [calls, total, self time, max]})
+        self._frames = deque(maxlen=window)
+        self._current = {}
+        self._frame_start = None
 
-        return False
-    
-    # ---- OVERRING POSITION AND SIZE SETTER TO RELOAD LABEL POSTION AFTER ----
-    @property
-    def placement(self) -> tuple:
-        return self._placement
+        # Time spent in nested calls of every running timed call
+        self._stack = []
 
-    @placement.setter
-    def placement(self, p:tuple):
-        self._placement = p
+    def enable(self):
+        """
+        Starts timing, wraps methods of all UI classes including your own subclasses defined so far
+        """
+        if self.enabled:
+            return
 
-        self.reload_label_pos()
+        # Classes inheriting from two UI classes are found twice
+        for cls in dict.fromkeys(self._classes(CompactUIObject)):
+            for name in self.METHODS:
+                attr = cls.__dict__.get(name)
 
-    @property
-    def size(self) -> tuple:
-        return self.placement[2:]
-    
-    @size.setter
-    def size(self, s:tuple):
-        self.placement = (self.x, self.y, *s)
+                if isinstance(attr, property):
+                    wrapped = property(self._wrap(attr.fget, name), attr.fset, attr.fdel, attr.__doc__)
+                elif callable(attr):
+                    wrapped = self._wrap(attr, name)
+                else:
+                    continue
 
-        self.reload_label_pos()
+                self._originals.append((cls, name, attr))
+                setattr(cls, name, wrapped)
 
-    @property
-    def position(self) -> tuple:
-        return self.placement[:2]
-    
-    @position.setter
-    def position(self, pos:tuple):
-        self.placement = (*pos, self.width, self.height)
+        self.enabled = True
+        self._frame_start = perf_counter()
 
-        self.reload_label_pos()
-    
-    @property
-    def x(self) -> int:
-        return self.placement[0]
+    def disable(self):
+        """
+        Stops timing and restores original methods, gathered timings are kept
+        """
+        for cls, name, attr in self._originals:
+            setattr(cls, name, attr)
 
-    @x.setter
-    def x(self, new_x:int):
-        self.placement = (new_x, *self.placement[1:])
+        self._originals = []
+        self._stack = []
+        self.enabled = False
 
-        self.reload_label_pos()
-    
-    @property
-    def y(self) -> int:
-        return self.placement[1]
+    def clear(self):
+        """
+        Forgets all gathered timings
+        """
+        self._frames.clear()
+        self._current = {}
+        self._frame_start = perf_counter()
 
-    @y.setter
-    def y(self, new_y:int):
-        self.placement = (self.x, new_y, *self.size)
+    def end_frame(self):
+        """
+        Closes current frame and starts a new one, call it once per frame, ex. after 'pygame.display.flip()'
+        """
+        now = perf_counter()
 
-        self.reload_label_pos()
+        if self._frame_start is not None:
+            if self._frames.maxlen != self.window:
+                self._frames = deque(self._frames, maxlen=self.window)
 
-class Label(UIObject):
-    def __init__(self, placement:tuple, text:str, font_size:Optional[int]=None, font_color:tuple=(0, 0, 0), font:str="monospace", alpha:int=255):
-        super().__init__(placement)
-        self.font = font
-        self.font_size = font_size
-        self.max_font = None
-        self.font_color = font_color
-        self.alpha = alpha
-        self.text = text
-    
-    @property
-    def text(self) -> str:
-        return self._text
-    
-    @text.setter
-    def text(self, t:str):
-        self._text = t
+            self._frames.append((now - self._frame_start, self._current))
 
-        self.reload_label()
+        self._current = {}
+        self._frame_start = now
 
-    @property
-    def font_size(self) -> int:
-        return self._font_size
+    def toggle_overlay(self):
+        """
+        Shows or hides overlay drawn by 'draw'
+        """
+        self.overlay_visible = not self.overlay_visible
 
-    @font_size.setter
-    def font_size(self, f:int):
-        self._font_size = f
+    def frame_times(self) -> list:
+        """
+        Returns durations of frames in the window in seconds
+        """
+        return [duration for duration, _ in self._frames]
 
-        self.reload_label()
-    
-    def get_width(self) -> int:
+    def stats(self, by:str='class') -> list:
         """
-        Gets actual width of text
+        Returns timings aggregated over the window, 'by' is 'class' or 'widget'. Every row has 'name', 'method', 'calls', 'total_ms',
+        'self_ms' (without nested timed calls), 'max_ms' and 'per_frame_ms', rows are sorted from the slowest self time
         """
-        if not self.label is None:
-            return self.label.get_width()
-        
-        return 0
-    
-    def get_height(self) -> int:
+        if by not in ('class', 'widget'):
+            raise ValueError("'by' has to be 'class' or 'widget'")
+
+        rows = {}
+        for _, timings in self._frames:
+            for (class_name, widget_name, method), (calls, total, self_time, longest) in timings.items():
+                key = (class_name if by == 'class' else widget_name, method)
+                row = rows.setdefault(key, [0, 0.0, 0.0, 0.0])
+
+                row[0] += calls
+                row[1] += total
+                row[2] += self_time
+                row[3] = max(row[3], longest)
+
+        frames = max(len(self._frames), 1)
+        result = [{
+            'name': name,
+            'method': method,
+            'calls': calls,
+            'total_ms': total * 1000,
+            'self_ms': self_time * 1000,
+            'max_ms': longest * 1000,
+            'per_frame_ms': self_time * 1000 / frames,
+        } for (name, method), (calls, total, self_time, longest) in rows.items()]
+
+        result.sort(key=lambda row: row['self_ms'], reverse=True)
+
+        return result
+
+    def export_json(self, path:str):
         """
-        Gets actual height of text
+        Saves frame times and timings per class and per widget to JSON file
         """
-        if not self.label is None:
-            return self.label.get_height()
-        
-        return 0
+        with open(path, 'w') as f:
+            json.dump({
+                'frames': len(self._frames),
+                'frame_times_ms': [t * 1000 for t in self.frame_times()],
+                'classes': self.stats('class'),
+                'widgets': self.stats('widget'),
+            }, f, indent=4)
+
+    def export_csv(self, path:str):
+        """
+        Saves timings per class and per widget to CSV file, 'scope' column tells which one the row is
+        """
+        fields = ('scope', 'name', 'method', 'calls', 'total_ms', 'self_ms', 'max_ms', 'per_frame_ms')
 
-    def reload_label(self):
+        with open(path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=fields)
+            writer.writeheader()
+
+            for scope in ('class', 'widget'):
+                for row in self.stats(scope):
+                    writer.writerow({'scope': scope, **row})
+
+    def draw(self, surface:pygame.Surface, position:tuple=(0, 0), rows:int=10, by:str='class') -> Optional[pygame.Rect]:
         """
-        Renders pygame label
+        Draws overlay with average frame time and the slowest classes or widgets, does nothing when overlay is hidden.
+        Returns changed rectangle
         """
-        # Prevents from error when initializing the oject, reload method is called after font size is set but text is still not set
-        try:
-            # If font is not specified find the biggest possible font and render label
-            if self.font_size is None:
-                self.max_font = self._find_biggest_possible_font()
+        if not self.overlay_visible:
+            return None
 
-                if self.max_font is None:
-                    print("\033[91m Can't render label, too small space \033[0m")
-                    self.label = None
-                    return
+        times = self.frame_times()
+        average = sum(times) / len(times) * 1000 if times else 0
+        longest = max(times) * 1000 if times else 0
 
-                self.label = pygame.font.SysFont(self.font, self.max_font).render(f'{self.text}', 1, (*self.font_color, self.alpha/255))
-                return
-            # Font specified, render normal label
-            self.label = pygame.font.SysFont(self.font, self.font_size).render(f'{self.text}', 1, (*self.font_color, self.alpha/255))
-        except AttributeError as err:
-            self.label = None
+        lines = [f'frame {average:7.2f} ms  max {longest:7.2f} ms  {len(times)} frames']
+        lines += [f'{row["name"][:28]:28} {row["method"][:14]:14} {row["per_frame_ms"]:7.3f} ms {row["calls"]:7}' for row in self.stats(by)[:rows]]
 
-    def draw(self, surface):
+        font = font_registry.get('monospace', 12)
+        rendered = [font.render(line, True, (255, 255, 255)) for line in lines]
+
+        line_height = font.get_linesize()
+        overlay = pygame.Surface((max(r.get_width() for r in rendered) + 8, line_height * len(rendered) + 8), pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 180))
+
+        for i, r in enumerate(rendered):
+            overlay.blit(r, (4, 4 + i * line_height))
+
+        return surface.blit(overlay, position)
+
+    def _wrap(self, func:Callable, method:str) -> Callable:
         """
-        Draws itself on a given surface
+        Returns function that times given method and records it for the object it's called on
         """
-        # Draw label
-        if self.label is not None:
-            surface.blit(self.label, self.position)
+        stack = self._stack
 
-    def _find_biggest_possible_font(self) -> Optional[int]:
+        @wraps(func)
+        def timed(obj, *args, **kwargs):
+            stack.append(0.0)
+            start = perf_counter()
+
+            try:
+                return func(obj, *args, **kwargs)
+            finally:
+                elapsed = perf_counter() - start
+                nested = stack.pop()
+
+                if stack:
+                    stack[-1] += elapsed
+
+                self._record(obj, method, elapsed, elapsed - nested)
+
+        return timed
+
+    def _record(self, obj, method:str, elapsed:float, self_time:float):
         """
-        Finds the biggest possible font for set text, height and width
+        Adds one call to the current frame
         """
-        max_width = self.placement[2]
-        max_height = self.placement[3]
-        
-        current_max_font = min(max_height, max_width)
-        testing_label = pygame.font.SysFont(self.font, current_max_font).render(f'{self.text}', 1, (*self.font_color, 1))
+        class_name = type(obj).__name__
+        key = (class_name, f'{class_name} {id(obj):#x}', method)
 
-        while current_max_font > 1:
+        timing = self._current.get(key)
+        if timing is None:
+            self._current[key] = [1, elapsed, self_time, elapsed]
+        else:
+            timing[0] += 1
+            timing[1] += elapsed
+            timing[2] += self_time
+            timing[3] = max(timing[3], elapsed)
 
-            if testing_label.get_width() <= max_width and testing_label.get_height() <= max_height:
-                return current_max_font
+    @staticmethod
+    def _classes(cls:type):
+        """
+        Yields given class and all its subclasses
+        """
+        yield cls
 
-            current_max_font -= 1
-            testing_label = pygame.font.SysFont(self.font, current_max_font).render(f'{self.text}', 1, (*self.font_color, 1))
+        for sub_cls in cls.__subclasses__():
+            yield from Profiler._classes(sub_cls)
 
-        return None
+profiler = Profiler()
 
-    @property
-    def current_font_size(self) -> int:
-        return self.max_font if self.font_size is None else self.font_size
+class Palette():
+    """
+    Colors loaded from 'colors.json' with precomputed RGB and RGBA tuples, pygame colors and mapped pixel values.
+    Pygame colors are shared, don't modify them
+    """
+    def __init__(self, colors:dict):
+        self.rgb = MappingProxyType({name: tuple(c[:3]) for name, c in colors.items()})
+        # Alpha in json file is from 0 to 1
+        self.rgba = MappingProxyType({name: (*c[:3], round(c[3] * 255)) for name, c in colors.items()})
+        self.color = MappingProxyType({name: pygame.Color(*rgba) for name, rgba in self.rgba.items()})
 
-    # ---- OVERRIDE SIZE SETTER TO RELOAD LABEL AFTER CHAINING ITS SIZE ----
-    @property
-    def placement(self) -> tuple:
-        return self._placement
+        # Surface format -> color name -> mapped pixel value
+        self._mapped = {}
 
-    @placement.setter
-    def placement(self, p:tuple):
-        self._placement = p
+    def mapped(self, surface:pygame.Surface) -> MappingProxyType:
+        """
+        Returns colors as pixel values in format of a given surface, ready to use with 'fill' and drawing functions
+        """
+        surface_format = (surface.get_bitsize(), surface.get_flags() & pygame.SRCALPHA, surface.get_masks(), surface.get_shifts())
 
-        self.reload_label()
+        try:
+            return self._mapped[surface_format]
+        except KeyError:
+            mapped = MappingProxyType({name: surface.map_rgb(rgba) for name, rgba in self.rgba.items()})
+            self._mapped[surface_format] = mapped
+
+            return mapped
+
+@lru_cache(maxsize=None)
+def load_palette() -> Palette:
+    """
+    Loads 'colors.json' from the directory of this file, only the first call reads the file
+    """
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'colors.json')
+
+    # Fall back to the working directory when colors.json isn't next to this file
+    if not os.path.exists(path):
+        path = 'colors.json'
+
+    try:
+        with open(path, 'r') as f:
+            return Palette(json.load(f))
+    except FileNotFoundError as err:
+        print("\033[91m Couldn't find 'colors.json' file inside script directory \033[0m")
+        return Palette({})
 
 class Colors():
-    def __init__(self):
+    """
+    Gives access to colors from 'colors.json' as properties ex. Colors().white or like a dictionary Colors()['white'].
+    File is loaded only once and colors can't be changed
+    """
+    __slots__ = ()
+
+    def __getattr__(self, name:str) -> tuple:
         try:
-            # Load colors from json file
-            with open('colors.json', 'r') as f:
-                colors = json.load(f)
-                # Set them as properties of an object
-                for key, item in colors.items():
-                    setattr(self, key, tuple(item[:-1]))
-        except FileNotFoundError as err:
-            print("\033[91m Couldn't find 'colors.json' file inside script directory \033[0m")
+            return load_palette().rgb[name]
+        except KeyError:
+            raise AttributeError(f"'Colors' object has no attribute '{name}'") from None
+
+    def __setattr__(self, name:str, value):
+        raise AttributeError("Colors can't be changed")
 
     # Allows colors to be accessed like a dictionary
     def __getitem__(self, key):
         try:
-            return self.__dict__[key]
+            return load_palette().rgb[key]
         except KeyError as err:
             print(f'\033[91m There is no color named: {key} \033[0m')
             return None
+
+    def rgba(self, name:str) -> tuple:
+        """
+        Returns color as (R, G, B, A) tuple
+        """
+        return load_palette().rgba[name]
+
+    def color(self, name:str) -> pygame.Color:
+        """
+        Returns shared pygame color, don't modify it
+        """
+        return load_palette().color[name]
+
+    def mapped(self, name:str, surface:pygame.Surface) -> int:
+        """
+        Returns color as a pixel value in format of a given surface
+        """
+        return load_palette().mapped(surface)[name]
+
+# Names of types that can be used in layout files
+_UI_TYPES = {
+    'Placeholder': Placeholder,
+    'Background': Background,
+    'Label': Label,
+    'Button': Button,
+    'Checkbox': Checkbox,
+    'Slider': Slider,
+}
+
+_LAYOUT_TYPES = {
+    'RowLayout': RowLayout,
+    'ColumnLayout': ColumnLayout,
+    'GridLayout': GridLayout,
+}
+
+# Beginning of snapshot files, followed by version, length of JSON header, header and pixels of rendered texts
+_SNAPSHOT_MAGIC = b'PGUI'
+_SNAPSHOT_VERSION = 1
+
+def build_tree(description:dict, placements:Optional[list]=None) -> tuple:
+    """
+    Creates UI objects from a description, ex. loaded from a layout file. Returns the root object and a dictionary
+    of objects which have an 'id'. Given placements are used instead of the described ones, in drawing order
+    """
+    ids = {}
+    root = _build_object(description, ids, iter(placements) if placements is not None else None)
+
+    return root, ids
+
+def _build_object(description:dict, ids:dict, placements) -> Type[CompactUIObject]:
+    """
+    Creates an object and its sub objects from a description
+    """
+    options = dict(description)
+    kind = options.pop('type', None)
+    object_id = options.pop('id', None)
+    layout = options.pop('layout', None)
+    children = options.pop('children', [])
+    # Used by the layout of the parent
+    options.pop('weight', None)
+
+    if kind not in _UI_TYPES:
+        raise ValueError(f"\033[91m Unknown UI object type: {kind} \033[0m")
+
+    if 'placement' not in options:
+        raise ValueError(f"\033[91m {kind} needs a placement \033[0m")
+
+    # Colors can be given by name from 'colors.json'
+    for name, value in options.items():
+        if name.endswith('color'):
+            options[name] = _resolve_color(value)
+
+    options['placement'] = tuple(options['placement'] if placements is None else next(placements))
+    obj = _UI_TYPES[kind](**options)
+
+    if object_id is not None:
+        ids[object_id] = obj
+
+    if layout is not None:
+        layout_options = dict(layout)
+        layout_kind = layout_options.pop('type', None)
+
+        if layout_kind not in _LAYOUT_TYPES:
+            raise ValueError(f"\033[91m Unknown layout type: {layout_kind} \033[0m")
+
+        obj.layout = _LAYOUT_TYPES[layout_kind](**layout_options)
+
+    for child in children:
+        sub_obj = _build_object(child, ids, placements)
+        obj.add_sub_object(sub_obj)
+
+        if obj.layout is not None:
+            # Laid out placements are loaded, the layout still needs described sizes for later changes
+            if placements is not None:
+                obj.layout.set_size(sub_obj, tuple(child['placement'][2:]))
+
+            if 'weight' in child:
+                obj.layout.set_weight(sub_obj, child['weight'])
+
+    return obj
+
+def _resolve_color(value) -> tuple:
+    """
+    Returns color given as a name from 'colors.json' or a list as a tuple
+    """
+    if isinstance(value, str):
+        try:
+            return load_palette().rgb[value]
+        except KeyError:
+            raise ValueError(f"\033[91m There is no color named: {value} \033[0m") from None
+
+    return tuple(value)
+
+def load_layout(path:str) -> tuple:
+    """
+    Creates UI objects from a JSON layout file, returns the root object and a dictionary of objects which have an 'id'
+    """
+    with open(path, 'r') as f:
+        return build_tree(json.load(f))
+
+def compile_layout(layout:Union[str, dict], output:str) -> int:
+    """
+    Builds UI from a JSON layout file or a description, lays it out and saves a snapshot with placements, fitted font sizes
+    and rendered texts. Loading the snapshot doesn't search font sizes or render texts. Returns size of the snapshot in bytes
+    """
+    if isinstance(layout, str):
+        with open(layout, 'r') as f:
+            description = json.load(f)
+    else:
+        description = layout
+
+    root, _ = build_tree(description)
+
+    # Layouts of containers change placements of their sub objects, so parents go first
+    for obj in UIManager._walk(root):
+        if isinstance(obj, Surfaces):
+            obj.apply_layout()
+
+    placements = [obj.placement for obj in UIManager._walk(root)]
+
+    # Objects created with laid out placements can differ from laid out ones, so fonts and texts are taken from the tree that will be loaded
+    root, _ = build_tree(description, placements)
+    objects = list(UIManager._walk(root))
+    fitted = {}
+
+    for obj in objects:
+        for part in (obj, *obj._batched_parts()):
+            if isinstance(part, CompactLabel) and part.font_size is None and part.max_font is not None:
+                fitted[(part.font, f'{part.text}', part.placement[2], part.placement[3])] = part.max_font
+
+    texts = []
+    pixels = []
+    offset = 0
+
+    for request in dict.fromkeys(text_requests(root)):
+        surface = text_cache.render(*request)
+        data = pygame.image.tobytes(surface, 'RGBA')
+
+        texts.append({'request': request, 'size': surface.get_size(), 'offset': offset, 'length': len(data)})
+        pixels.append(data)
+        offset += len(data)
+
+    header = json.dumps({
+        'description': description,
+        'placements': placements,
+        'fitted': [[*key, size] for key, size in fitted.items()],
+        'texts': texts,
+    }).encode('utf-8')
+
+    with open(output, 'wb') as f:
+        f.write(_SNAPSHOT_MAGIC)
+        f.write(struct.pack('<HI', _SNAPSHOT_VERSION, len(header)))
+        f.write(header)
+        for data in pixels:
+            f.write(data)
+
+    return len(_SNAPSHOT_MAGIC) + struct.calcsize('<HI') + len(header) + offset
+
+def load_snapshot(path:str) -> tuple:
+    """
+    Creates UI objects from a snapshot saved by 'compile_layout', returns the root object and a dictionary of objects which have an 'id'
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    if not data.startswith(_SNAPSHOT_MAGIC):
+        raise ValueError(f"\033[91m {path} isn't a UI snapshot \033[0m")
+
+    version, header_length = struct.unpack_from('<HI', data, len(_SNAPSHOT_MAGIC))
+    if version != _SNAPSHOT_VERSION:
+        raise ValueError(f"\033[91m Unsupported UI snapshot version: {version} \033[0m")
+
+    start = len(_SNAPSHOT_MAGIC) + struct.calcsize('<HI')
+    header = json.loads(data[start:start + header_length])
+    pixels = memoryview(data)[start + header_length:]
+
+    for font, text, width, height, size in header['fitted']:
+        _fitted_font_sizes[(font, text, width, height)] = size
+
+    # Texts are in the cache before objects render their labels
+    for text in header['texts']:
+        offset = text['offset']
+        surface = pygame.image.frombytes(bytes(pixels[offset:offset + text['length']]), text['size'], 'RGBA')
+        text_cache.put(surface, *text['request'])
+
+    return build_tree(header['description'], header['placements'])
+
+def render_offscreen(jobs:list, processes:Optional[int]=None, chunk_size:int=8, background:tuple=(255, 255, 255)) -> list:
+    """
+    Renders many UI trees without a window in a pool of processes, useful for thumbnails and screenshots. Every job is a tuple (tree, output),
+    tree is a description like in layout files, a path to a layout file or a path to a snapshot. Output is a path of an image file, a path ending
+    with '.raw' for RGB pixels or None to return them. Returns output paths and (size, pixels) for jobs without an output
+    """
+    jobs = [(tree, output, background) for tree, output in jobs]
+
+    # Starting processes isn't worth it for a few jobs or a single core
+    if (processes or os.cpu_count() or 1) == 1 or len(jobs) <= chunk_size:
+        return [_render_offscreen_job(job) for job in jobs]
+
+    # Workers are started from scratch so every one has its own pygame without the display of this process
+    with ProcessPoolExecutor(processes, mp_context=multiprocessing.get_context('spawn'), initializer=_init_offscreen_worker) as pool:
+        return list(pool.map(_render_offscreen_job, jobs, chunksize=chunk_size))
+
+def _init_offscreen_worker():
+    """
+    Starts pygame without a window in a worker process of 'render_offscreen'
+    """
+    os.environ['SDL_VIDEODRIVER'] = 'dummy'
+    pygame.init()
+
+def _render_offscreen_job(job:tuple):
+    """
+    Builds and draws one tree of 'render_offscreen', saves it or returns its size and RGB pixels
+    """
+    tree, output, background = job
+
+    if not pygame.font.get_init():
+        pygame.font.init()
+
+    if isinstance(tree, dict):
+        root, _ = build_tree(tree)
+    elif tree.endswith('.json'):
+        root, _ = load_layout(tree)
+    else:
+        root, _ = load_snapshot(tree)
+
+    surface = pygame.Surface((root.x + root.width, root.y + root.height))
+    surface.fill(background)
+    root.draw(surface)
+
+    if output is None:
+        return surface.get_size(), pygame.image.tobytes(surface, 'RGB')
+
+    if output.endswith('.raw'):
+        with open(output, 'wb') as f:
+            f.write(pygame.image.tobytes(surface, 'RGB'))
+    else:
+        pygame.image.save(surface, output)
+
+    return output
@@ -0,0 +1,655 @@
+"""
+Headless benchmarks of the most expensive parts of UIComponents.
+
+Usage:
+    python benchmarks/benchmark.py                          # run everything and print results
+    python benchmarks/benchmark.py -o results.json          # save results as JSON
+    python benchmarks/benchmark.py -c old.json              # compare with saved results, exits with 1 on regression
+    python benchmarks/benchmark.py -k draw -n 500           # only benchmarks containing 'draw', 500 widgets
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable
+
+# Run without a window
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+import UIComponents
+from UIComponents import Background, Button, Checkbox, CheckboxBatch, Placeholder, Slider, UIManager
+
+
+RED = (255, 0, 0)
+BLACK = (0, 0, 0)
+WHITE = (255, 255, 255)
+
+# Name -> function taking amount of widgets and returning function to measure
+BENCHMARKS = {}
+
+
+def benchmark(name:str):
+    """
+    Registers a benchmark, decorated function gets amount of widgets, prepares everything and returns function that will be timed
+    """
+    def register(setup:Callable) -> Callable:
+        BENCHMARKS[name] = setup
+        return setup
+
+    return register
+
+
+def clear_caches():
+    """
+    Forgets all cached fonts, texts and font sizes so the next measurement starts cold
+    """
+    UIComponents.font_registry.clear()
+    UIComponents.text_cache.clear()
+    UIComponents._fit_font_size.cache_clear()
+    UIComponents._fitted_font_sizes.clear()
+
+
+def grid_placements(n:int, width:int, height:int, columns:int=20) -> list:
+    return [((i % columns) * (width + 5), (i // columns) * (height + 5), width, height) for i in range(n)]
+
+
+def make_buttons(n:int, font_size=None) -> list:
+    return [Button(p, RED, f'Button {i}', font_size=font_size) for i, p in enumerate(grid_placements(n, 120, 40))]
+
+
+def make_checkboxes(n:int, font_size=None) -> list:
+    return [Checkbox(p, BLACK, RED, f'Checkbox {i}', font_size=font_size) for i, p in enumerate(grid_placements(n, 150, 30))]
+
+
+def make_sliders(n:int) -> list:
+    return [Slider(p, 0, 100, 1, 50, RED, BLACK, f'Slider {i}', font_size=12) for i, p in enumerate(grid_placements(n, 100, 5))]
+
+
+# ---- CONSTRUCTION ----
+@benchmark('construct.button.autofit')
+def construct_button_autofit(n:int) -> Callable:
+    return lambda: make_buttons(n)
+
+
+@benchmark('construct.button.autofit_cold')
+def construct_button_autofit_cold(n:int) -> Callable:
+    clear_caches()
+    return lambda: make_buttons(n)
+
+
+@benchmark('construct.button.fixed_font')
+def construct_button_fixed_font(n:int) -> Callable:
+    return lambda: make_buttons(n, font_size=16)
+
+
+@benchmark('construct.checkbox.autofit')
+def construct_checkbox_autofit(n:int) -> Callable:
+    return lambda: make_checkboxes(n)
+
+
+@benchmark('construct.checkbox.fixed_font')
+def construct_checkbox_fixed_font(n:int) -> Callable:
+    return lambda: make_checkboxes(n, font_size=16)
+
+
+@benchmark('construct.slider')
+def construct_slider(n:int) -> Callable:
+    return lambda: make_sliders(n)
+
+
+# ---- DRAWING ----
+def make_tree(n:int, **container_options) -> Background:
+    """
+    Builds background with placeholders, each with a background holding buttons, checkboxes and sliders
+    """
+    root = Background((0, 0, 1280, 720), WHITE, 255, **container_options)
+
+    per_panel = 30
+    for panel_index in range((n + per_panel - 1) // per_panel):
+        placeholder = Placeholder((panel_index % 4 * 320, panel_index // 4 % 4 * 180, 320, 180))
+        panel = Background((5, 5, 310, 170), (200, 200, 200), 180)
+
+        for i in range(min(per_panel, n - panel_index * per_panel)):
+            x, y = i % 3 * 100, i // 3 * 16
+            kind = i % 3
+            if kind == 0:
+                panel.add_sub_object(Button((x, y, 95, 14), RED, f'B{i}'))
+            elif kind == 1:
+                panel.add_sub_object(Checkbox((x, y, 95, 14), BLACK, RED, f'C{i}'))
+            else:
+                panel.add_sub_object(Slider((x + 5, y + 5, 80, 3), 0, 80, 1, i, RED, BLACK, f'S{i}', font_size=8))
+
+        placeholder.add_sub_object(panel)
+        root.add_sub_object(placeholder)
+
+    return root
+
+
+@benchmark('draw.tree.full')
+def draw_tree_full(n:int) -> Callable:
+    root = make_tree(n)
+    screen = pygame.Surface(root.size)
+    root.draw(screen)
+
+    return lambda: root.draw(screen)
+
+
+@benchmark('draw.tree.retained')
+def draw_tree_retained(n:int) -> Callable:
+    root = make_tree(n, retained=True)
+    screen = pygame.Surface(root.size)
+    root.draw(screen)
+
+    return lambda: root.draw(screen)
+
+
+@benchmark('draw.tree.dirty_one_change')
+def draw_tree_dirty_one_change(n:int) -> Callable:
+    root = make_tree(n, dirty_tracking=True)
+    screen = pygame.Surface(root.size)
+    root.draw(screen)
+
+    # Change one checkbox per frame
+    checkbox = next(obj for obj in UIManager._walk(root) if isinstance(obj, Checkbox))
+
+    def run():
+        checkbox.checked = not checkbox.checked
+        root.draw(screen)
+
+    return run
+
+
+@benchmark('draw.checkboxes')
+def draw_checkboxes(n:int) -> Callable:
+    checkboxes = make_checkboxes(n, font_size=12)
+    surface = pygame.Surface((4000, 4000))
+
+    def run():
+        for checkbox in checkboxes:
+            checkbox.draw(surface)
+
+    return run
+
+
+@benchmark('draw.checkbox_batch')
+def draw_checkbox_batch(n:int) -> Callable:
+    batch = CheckboxBatch((0, 0, 4000, 4000), (150, 30), BLACK, RED, font_size=12)
+    for i, p in enumerate(grid_placements(n, 150, 30)):
+        batch.add(p[:2], f'Checkbox {i}', checked=i % 2 == 0)
+    surface = pygame.Surface((4000, 4000))
+
+    return lambda: batch.draw(surface)
+
+
+# ---- LAYOUTS ----
+@benchmark('layout.resize')
+def layout_resize(n:int) -> Callable:
+    """
+    Window is resized every frame, panels in a grid lay out their widgets in columns
+    """
+    root = Background((0, 0, 1280, 720), WHITE, 255)
+    root.layout = UIComponents.GridLayout(4, spacing=5, padding=5)
+
+    per_panel = 30
+    for panel_index in range((n + per_panel - 1) // per_panel):
+        panel = Background((0, 0, 310, 170), (200, 200, 200), 180)
+        panel.layout = UIComponents.ColumnLayout(spacing=1, stretch=True)
+
+        for i in range(min(per_panel, n - panel_index * per_panel)):
+            if i % 2:
+                panel.add_sub_object(Button((0, 0, 95, 14), RED, f'B{i}', font_size=10))
+            else:
+                panel.add_sub_object(Checkbox((0, 0, 95, 14), BLACK, RED, f'C{i}', font_size=10))
+
+        root.add_sub_object(panel)
+
+    screen = pygame.Surface((1920, 1080))
+    root.draw(screen)
+
+    def run():
+        # Shrink below and grow past the initial size
+        for frame in range(30):
+            root.size = (1000 + frame * 30, 720 + frame * 10)
+            root.draw(screen)
+
+        # Panels laid out past the initial size have to be drawn
+        last = root._sub_objects[min(3, len(root._sub_objects) - 1)]
+        assert last.x + last.width > 1280 or len(root._sub_objects) < 4
+        assert root.surface.get_size() == root.size, 'surface of the root has not been resized'
+        assert root.surface.get_at((last.x + last.width - 2, last.y + last.height - 2))[:3] != WHITE, 'panel outside of the initial size is not drawn'
+
+    return run
+
+
+# ---- SCROLLING ----
+def scroll_list(rows:int) -> Callable:
+    """
+    Returns function scrolling a list with given amount of rows of different heights and drawing it every frame
+    """
+    def update_row(button, index):
+        button.text = f'Row {index}'
+
+    rows = UIComponents.ScrollList((0, 0, 320, 600), rows, lambda: Button((0, 0, 1, 1), RED, '', font_size=12), update_row,
+                                   lambda index: 20 + index % 3 * 5)
+    screen = pygame.Surface((320, 600))
+    rows.draw(screen)
+
+    def run():
+        for frame in range(100):
+            rows.scroll_by(7)
+            rows.draw(screen)
+
+    return run
+
+
+@benchmark('scroll.list.1k')
+def scroll_list_1k(n:int) -> Callable:
+    return scroll_list(1000)
+
+
+@benchmark('scroll.list.100k')
+def scroll_list_100k(n:int) -> Callable:
+    return scroll_list(100000)
+
+
+@benchmark('scroll.list.append_100k')
+def scroll_list_append_100k(n:int) -> Callable:
+    """
+    Log with 100000 rows following its end, a row is added every frame
+    """
+    def update_row(button, index):
+        button.text = f'Line {index}'
+
+    rows = UIComponents.ScrollList((0, 0, 320, 600), 100000, lambda: Button((0, 0, 1, 1), RED, '', font_size=12), update_row, 20)
+    rows.scroll = rows.content_height
+    screen = pygame.Surface((320, 600))
+    rows.draw(screen)
+
+    def run():
+        for frame in range(100):
+            rows.row_count += 1
+            rows.scroll = rows.content_height
+            rows.draw(screen)
+
+    return run
+
+
+# ---- BLITTING ----
+def blit_many(source:pygame.Surface, n:int) -> Callable:
+    """
+    Returns function blitting given surface n times on a screen sized surface in display format
+    """
+    screen = pygame.Surface((1280, 720)).convert()
+    positions = [(i * 37 % 960, i * 23 % 540) for i in range(n)]
+
+    return lambda: screen.blits([(source, pos) for pos in positions], doreturn=False)
+
+
+def make_panel(**container_options) -> Placeholder:
+    """
+    Placeholder with a few widgets, mostly transparent
+    """
+    panel = Placeholder((0, 0, 320, 180), **container_options)
+    for i in range(6):
+        panel.add_sub_object(Button((10, 10 + i * 28, 140, 24), RED, f'Button {i}'))
+
+    return panel
+
+
+@benchmark('blit.container.per_pixel_alpha')
+def blit_container_per_pixel_alpha(n:int) -> Callable:
+    # How opaque backgrounds used to be stored
+    surface = pygame.Surface((320, 180), pygame.SRCALPHA)
+    surface.fill((*WHITE, 255))
+
+    return blit_many(surface, n)
+
+
+@benchmark('blit.container.opaque')
+def blit_container_opaque(n:int) -> Callable:
+    return blit_many(Background((0, 0, 320, 180), WHITE, 255).surface, n)
+
+
+@benchmark('blit.container.transparent')
+def blit_container_transparent(n:int) -> Callable:
+    panel = make_panel(retained=True)
+    screen = pygame.Surface((1280, 720)).convert()
+    for _ in range(5):
+        panel.draw(screen)
+
+    return blit_many(panel.surface, n)
+
+
+@benchmark('blit.container.transparent_rle')
+def blit_container_transparent_rle(n:int) -> Callable:
+    panel = make_panel(retained=True)
+    panel.rle = True
+    screen = pygame.Surface((1280, 720)).convert()
+    # RLE is used after a few draws without changes
+    for _ in range(5):
+        panel.draw(screen)
+
+    return blit_many(panel.surface, n)
+
+
+@benchmark('blit.text.unconverted')
+def blit_text_unconverted(n:int) -> Callable:
+    return blit_many(UIComponents.font_registry.get('monospace', 24).render('Some label text', True, (0, 0, 0, 255)), n)
+
+
+@benchmark('blit.text.cached')
+def blit_text_cached(n:int) -> Callable:
+    return blit_many(UIComponents.text_cache.render('monospace', 24, 'Some label text', (0, 0, 0, 255)), n)
+
+
+# ---- CHANGING TEXT ----
+@benchmark('text.changing')
+def text_changing(n:int) -> Callable:
+    """
+    Changes text of score labels and sliders like every frame of a game would
+    """
+    labels = [UIComponents.Label(p, 'Score: 0', font_size=16) for p in grid_placements(min(n, 100), 150, 30)]
+    sliders = [Slider(p, 0, 100, 0.1, 0, RED, BLACK, 'Time', font_size=12) for p in grid_placements(min(n, 100), 1000, 5)]
+
+    def run():
+        for frame in range(30):
+            for i, (label, slider) in enumerate(zip(labels, sliders)):
+                label.text = f'Score: {frame * 1000 + i}'
+                label.label
+                slider.value = (frame * 31 + i) % 1000 / 10
+                slider.label
+
+    return run
+
+
+# ---- STARTUP ----
+def menu_texts(n:int) -> list:
+    return [('monospace', 12 + i % 12, f'Menu item {i}', (0, 0, 0, 255)) for i in range(n * 10)]
+
+
+@benchmark('text.prerender.serial')
+def text_prerender_serial(n:int) -> Callable:
+    clear_caches()
+    requests = menu_texts(n)
+
+    return lambda: UIComponents.text_cache.prerender(requests, processes=1)
+
+
+@benchmark('text.prerender.pool')
+def text_prerender_pool(n:int) -> Callable:
+    clear_caches()
+    requests = menu_texts(n)
+
+    return lambda: UIComponents.text_cache.prerender(requests)
+
+
+# ---- LAYOUT FILES ----
+def settings_screen(n:int) -> dict:
+    """
+    Describes a screen with auto-fitted buttons and checkboxes in a grid, like a layout file
+    """
+    children = []
+    for i in range(n):
+        if i % 2:
+            children.append({'type': 'Checkbox', 'placement': [0, 0, 150, 30], 'checkbox_color': 'black', 'indicator_color': 'red', 'text': f'Option {i}'})
+        else:
+            children.append({'type': 'Button', 'placement': [0, 0, 150, 40], 'color': 'lightgray', 'text': f'Action {i}'})
+
+    return {'type': 'Background', 'placement': [0, 0, 1280, 720], 'color': 'white', 'alpha': 255,
+            'layout': {'type': 'GridLayout', 'columns': 8, 'spacing': 5}, 'children': children}
+
+
+@benchmark('startup.layout_file')
+def startup_layout_file(n:int) -> Callable:
+    description = settings_screen(n)
+    screen = pygame.Surface((1280, 720))
+
+    def run():
+        clear_caches()
+        root, _ = UIComponents.build_tree(description)
+        root.draw(screen)
+
+    return run
+
+
+@benchmark('startup.snapshot')
+def startup_snapshot(n:int) -> Callable:
+    path = os.path.join(tempfile.gettempdir(), f'uicomponents_benchmark_{n}.snap')
+    UIComponents.compile_layout(settings_screen(n), path)
+    screen = pygame.Surface((1280, 720))
+
+    def run():
+        clear_caches()
+        root, _ = UIComponents.load_snapshot(path)
+        root.draw(screen)
+
+    return run
+
+
+def thumbnail_jobs(n:int) -> list:
+    """
+    Returns jobs for 'render_offscreen' drawing variants of a small settings screen, one per 20 widgets
+    """
+    jobs = []
+    for i in range(max(n // 20, 1)):
+        screen = settings_screen(20)
+        screen['placement'] = [0, 0, 640, 240]
+        screen['color'] = ('white', 'lightgray', 'lightblue')[i % 3]
+        screen['children'][0]['text'] = f'Variant {i}'
+        jobs.append((screen, None))
+
+    return jobs
+
+
+@benchmark('offscreen.serial')
+def offscreen_serial(n:int) -> Callable:
+    jobs = thumbnail_jobs(n)
+
+    return lambda: UIComponents.render_offscreen(jobs, processes=1)
+
+
+@benchmark('offscreen.pool')
+def offscreen_pool(n:int) -> Callable:
+    jobs = thumbnail_jobs(n)
+
+    return lambda: UIComponents.render_offscreen(jobs, processes=os.cpu_count(), chunk_size=1)
+
+
+# ---- HIT TESTING ----
+def click_positions(widgets:list, count:int=200) -> list:
+    return [(w.get_absolute_pos()[0] + 2, w.get_absolute_pos()[1] + 2) for w in widgets[::max(1, len(widgets) // count)]]
+
+
+@benchmark('clicked.linear_scan')
+def clicked_linear_scan(n:int) -> Callable:
+    root = Placeholder((0, 0, 4000, 4000))
+    buttons = make_buttons(n)
+    for button in buttons:
+        root.add_sub_object(button)
+    positions = click_positions(buttons)
+
+    def run():
+        for pos in positions:
+            for button in buttons:
+                if button.clicked(pos):
+                    break
+
+    return run
+
+
+@benchmark('clicked.manager')
+def clicked_manager(n:int) -> Callable:
+    root = Placeholder((0, 0, 4000, 4000))
+    buttons = make_buttons(n)
+    for button in buttons:
+        root.add_sub_object(button)
+    manager = UIManager()
+    manager.add(root)
+    # Build index before measuring
+    manager.object_at((0, 0))
+    events = [pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=1) for pos in click_positions(buttons)]
+
+    def run():
+        for event in events:
+            manager.handle_event(event)
+
+    return run
+
+
+@benchmark('events.dispatch')
+def events_dispatch(n:int) -> Callable:
+    root = make_tree(n)
+    manager = UIManager()
+    manager.add(root)
+
+    # Only one panel listens, events over other panels and key presses skip their subtrees
+    panel = root._sub_objects[0]._sub_objects[0]
+    panel.add_event_listener(pygame.MOUSEMOTION, lambda event: None)
+    panel.add_event_listener(pygame.KEYDOWN, lambda event: None)
+
+    events = [pygame.event.Event(pygame.MOUSEMOTION, pos=(i * 13 % 1280, i * 7 % 720), rel=(1, 1), buttons=(0, 0, 0)) for i in range(500)]
+    events += [pygame.event.Event(pygame.KEYDOWN, key=pygame.K_a, mod=0, unicode='a', scancode=4) for _ in range(500)]
+
+    return lambda: manager.process_events(events)
+
+
+# ---- SLIDER DRAGGING ----
+@benchmark('slider.drag')
+def slider_drag(n:int) -> Callable:
+    sliders = make_sliders(min(n, 100))
+    surface = pygame.Surface((3000, 3000))
+
+    # Every slider is dragged across its whole bar and drawn every frame
+    frames = [[(s.x + (frame * 7) % s.width, s.y + 2) for s in sliders] for frame in range(30)]
+
+    def run():
+        for positions in frames:
+            for slider, pos in zip(sliders, positions):
+                slider.clicked(pos)
+                slider.draw(surface)
+
+    return run
+
+
+@benchmark('slider.drag_captured')
+def slider_drag_captured(n:int) -> Callable:
+    sliders = make_sliders(min(n, 100))
+    surface = pygame.Surface((3000, 3000))
+    manager = UIManager()
+    for slider in sliders:
+        manager.add(slider)
+
+    # One slider is dragged, every frame brings many motion events and all sliders are drawn
+    slider = sliders[len(sliders) // 2]
+    press = pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=(slider.x + 1, slider.y + 2), button=1)
+    frames = [[pygame.event.Event(pygame.MOUSEMOTION, pos=(slider.x + (frame * 7 + i) % slider.width, slider.y + 20), rel=(1, 0), buttons=(1, 0, 0))
+               for i in range(20)] for frame in range(30)]
+
+    def run():
+        manager.handle_event(press)
+        for events in frames:
+            manager.handle_events(events)
+            manager.draw(surface)
+
+    return run
+
+
+def measure(setup:Callable, n:int, repeats:int) -> dict:
+    """
+    Runs benchmark given number of times and returns its timings in seconds
+    """
+    timings = []
+
+    for _ in range(repeats):
+        run = setup(n)
+
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+
+    return {
+        'n': n,
+        'repeats': repeats,
+        'min': min(timings),
+        'median': statistics.median(timings),
+        'max': max(timings),
+    }
+
+
+def compare(results:dict, baseline:dict, threshold:float) -> list:
+    """
+    Returns names of benchmarks whose median got slower than baseline by more than threshold
+    """
+    regressions = []
+
+    for name, result in results.items():
+        old = baseline.get('results', {}).get(name)
+        if old is None or old['n'] != result['n']:
+            continue
+
+        ratio = result['median'] / old['median']
+        result['baseline_median'] = old['median']
+        result['ratio'] = ratio
+
+        if ratio > 1 + threshold:
+            regressions.append(name)
+
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Headless UIComponents benchmarks')
+    parser.add_argument('-n', '--widgets', type=int, default=1000, help='amount of widgets used by benchmarks')
+    parser.add_argument('-r', '--repeats', type=int, default=5, help='how many times every benchmark is run')
+    parser.add_argument('-k', '--keyword', default='', help='run only benchmarks containing this text')
+    parser.add_argument('-o', '--output', help='save results to JSON file')
+    parser.add_argument('-c', '--compare', help='compare with results saved in JSON file')
+    parser.add_argument('-t', '--threshold', type=float, default=0.1, help='allowed slowdown when comparing, 0.1 means 10%%')
+    args = parser.parse_args()
+
+    pygame.init()
+    # Surfaces are converted to the format of this display
+    pygame.display.set_mode((1, 1))
+
+    results = {}
+    for name, setup in BENCHMARKS.items():
+        if args.keyword in name:
+            results[name] = measure(setup, args.widgets, args.repeats)
+
+    regressions = []
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            regressions = compare(results, json.load(f), args.threshold)
+
+    for name, result in results.items():
+        line = f'{name:32} median {result["median"] * 1000:10.3f} ms   min {result["min"] * 1000:10.3f} ms'
+        if 'ratio' in result:
+            line += f'   x{result["ratio"]:.2f}' + ('  REGRESSION' if name in regressions else '')
+        print(line)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                'python': platform.python_version(),
+                'pygame': pygame.version.ver,
+                'platform': platform.platform(),
+                'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'results': results,
+            }, f, indent=4)
+
+    pygame.quit()
+
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
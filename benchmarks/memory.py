@@ -0,0 +1,138 @@
+"""
+Compares memory taken by regular UI objects and their compact, slot based versions, optionally also with objects of another
+version of UIComponents.py given as a baseline.
+
+Usage:
+    python benchmarks/memory.py                   # 10000 objects of every class
+    python benchmarks/memory.py -n 50000 -o memory.json
+    python benchmarks/memory.py -b old/UIComponents.py   # compare with UIComponents.py from before compact objects
+"""
+import argparse
+import gc
+import importlib.util
+import json
+import os
+import sys
+import time
+import tracemalloc
+from types import ModuleType
+from typing import Callable
+
+# Run without a window
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+import UIComponents
+
+
+RED = (255, 0, 0)
+BLACK = (0, 0, 0)
+
+# Class name -> factory getting a class and index of an object, used for 'Name' of the baseline and for 'Name' and 'CompactName' of UIComponents
+FACTORIES = {
+    'UIObject': lambda cls, i: cls((i, i, 10, 10)),
+    'Label': lambda cls, i: cls((i, 0, 100, 20), f'Label {i}', font_size=12),
+    'Button': lambda cls, i: cls((i, 0, 120, 40), RED, f'Button {i}', font_size=12),
+    'Checkbox': lambda cls, i: cls((i, 0, 150, 30), BLACK, RED, f'Checkbox {i}', font_size=12),
+    'Slider': lambda cls, i: cls((i, 0, 100, 5), 0, 100, 1, 50, RED, BLACK, f'Slider {i}', font_size=12),
+}
+
+
+def load_baseline(path:str) -> ModuleType:
+    """
+    Imports another version of UIComponents.py from given path, ex. one checked out before objects became compact
+    """
+    spec = importlib.util.spec_from_file_location('baseline_UIComponents', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    return module
+
+
+def measure(factory:Callable, n:int) -> dict:
+    """
+    Creates n objects and returns memory they take and time it took to create them
+    """
+    # Warm up fonts and caches so they aren't counted
+    factory(0)
+
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+
+    objects = [factory(i) for i in range(n)]
+
+    elapsed = time.perf_counter() - start
+    used, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # Touch geometry of every object, the fastest of a few rounds is less affected by other processes
+    move_times = []
+    for _ in range(5):
+        start = time.perf_counter()
+        for obj in objects:
+            obj.x = obj.x + 1
+        move_times.append(time.perf_counter() - start)
+    move_elapsed = min(move_times)
+
+    del objects
+
+    return {
+        'bytes_per_object': used / n,
+        'create_seconds': elapsed,
+        'move_seconds': move_elapsed,
+    }
+
+
+def saved(used:dict, reference:dict) -> float:
+    return 100 - used['bytes_per_object'] / reference['bytes_per_object'] * 100
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Memory footprint of baseline, regular and compact UI objects')
+    parser.add_argument('-n', '--objects', type=int, default=10000, help='amount of objects of every class')
+    parser.add_argument('-b', '--baseline', help='path of another UIComponents.py to compare with')
+    parser.add_argument('-o', '--output', help='save results to JSON file')
+    args = parser.parse_args()
+
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+
+    baseline = load_baseline(args.baseline) if args.baseline else None
+
+    results = {}
+    for name, factory in FACTORIES.items():
+        classes = {'regular': getattr(UIComponents, name), 'compact': getattr(UIComponents, f'Compact{name}')}
+        if baseline is not None:
+            classes['baseline'] = getattr(baseline, name)
+
+        results[name] = {kind: measure(lambda i, cls=cls: factory(cls, i), args.objects) for kind, cls in classes.items()}
+
+        r, c = results[name]['regular'], results[name]['compact']
+        line = f'{name:10} regular {r["bytes_per_object"]:8.0f} B   compact {c["bytes_per_object"]:8.0f} B   '
+
+        if baseline is not None:
+            b = results[name]['baseline']
+            line = (f'{name:10} baseline {b["bytes_per_object"]:8.0f} B   regular {r["bytes_per_object"]:8.0f} B ({saved(r, b):5.1f}% saved)   '
+                    f'compact {c["bytes_per_object"]:8.0f} B ({saved(c, b):5.1f}% saved)   ')
+        else:
+            line += f'saved {saved(c, r):5.1f}%   '
+
+        if baseline is not None:
+            line += f'move baseline {results[name]["baseline"]["move_seconds"] * 1000:7.2f} ms   '
+
+        print(line + f'move regular {r["move_seconds"] * 1000:7.2f} ms   compact {c["move_seconds"] * 1000:7.2f} ms')
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'objects': args.objects, 'baseline': baseline is not None, 'results': results}, f, indent=4)
+
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+import os
+import pygame
+from UIComponents import UIManager, compile_layout, load_snapshot
+
+# ---------- PYGAME SETUP ----------
+pygame.init()
+size = (400, 500)
+surface = pygame.display.set_mode(size)
+clock = pygame.time.Clock()
+stop = False
+# ----------------------------------
+
+# ----- LOADING UI FROM A LAYOUT FILE -----
+directory = os.path.dirname(os.path.abspath(__file__))
+layout_path = os.path.join(directory, 'layout_example.json')
+snapshot_path = os.path.join(directory, 'layout_example.snap')
+
+# Compile snapshot when the layout file is newer, normally it's done as a build step
+if not os.path.exists(snapshot_path) or os.path.getmtime(snapshot_path) < os.path.getmtime(layout_path):
+    compile_layout(layout_path, snapshot_path)
+
+# Loads objects without searching font sizes and rendering texts
+settings, ids = load_snapshot(snapshot_path)
+
+# Objects with an id can be reached through the dictionary
+def save():
+    print(f"Music: {ids['music'].checked}, fullscreen: {ids['fullscreen'].checked}, volume: {ids['volume'].value}")
+
+ids['save'].click_function = save
+ids['back'].click_function = lambda: print('Back')
+
+manager = UIManager()
+manager.add(settings)
+
+# Standard game loop
+while not stop:
+    for event in manager.process_events():
+        if event.type == pygame.QUIT:
+            stop = True
+
+    manager.draw(surface)
+
+    pygame.display.flip()
+    clock.tick(60)
+
+pygame.quit()
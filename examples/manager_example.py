@@ -0,0 +1,49 @@
+import pygame
+from UIComponents import UIManager, Background, Colors, Button, Checkbox
+
+# ---------- PYGAME SETUP ----------
+pygame.init()
+size = (400, 700)
+surface = pygame.display.set_mode(size)
+clock = pygame.time.Clock()
+stop = False
+# ----------------------------------
+
+# ----- CREATING A MANAGER -----
+manager = UIManager()
+background = Background((10, 200, 300, 400), Colors().red, 120)
+
+# Creating sub objects
+button = Button((50, 300, 150, 50), Colors().red, 'Click Me!')
+checkbox = Checkbox((50, 50, 200, 30), Colors().black, Colors().red, 'Check me')
+
+# Adding sub objects
+background.add_sub_object(button)
+background.add_sub_object(checkbox)
+
+# Manager takes care of the whole background with its sub objects
+manager.add(background)
+
+# Standard game loop
+while not stop:
+    # Standard event loop
+    for event in pygame.event.get():
+        if event.type == pygame.QUIT:
+            stop = True
+        else:
+            # Manager passes clicks only to the object under the mouse
+            clicked = manager.handle_event(event)
+
+            if clicked is button:
+                print('Clicked!')
+                # Do whatever you want to do after user has pressed a button
+
+    surface.fill(Colors().white)
+    
+    # Drawing all objects
+    manager.draw(surface)
+
+    pygame.display.flip()
+    clock.tick(30)
+
+pygame.quit()
@@ -0,0 +1,50 @@
+import pygame
+from UIComponents import UIManager, Background, ScrollList, Colors, Button
+
+# ---------- PYGAME SETUP ----------
+pygame.init()
+size = (400, 700)
+surface = pygame.display.set_mode(size)
+clock = pygame.time.Clock()
+stop = False
+# ----------------------------------
+
+# ----- CREATING A SCROLL LIST -----
+scores = [(f'Player {i}', (i * 7919) % 100000) for i in range(100000)]
+
+# Creates a widget for a row, it's called only for rows in view
+def create_row():
+    return Button((0, 0, 1, 1), Colors().lightgray, '', font_size=16)
+
+# Shows given row in a widget, widgets are reused when rows leave the view
+def update_row(button, index):
+    name, score = scores[index]
+    button.text = f'{index + 1}. {name}: {score}'
+
+# Every tenth row is taller
+def row_height(index):
+    return 40 if index % 10 == 0 else 25
+
+background = Background((0, 0, 400, 700), Colors().white, 255)
+leaderboard = ScrollList((50, 50, 300, 600), len(scores), create_row, update_row, row_height)
+background.add_sub_object(leaderboard)
+
+manager = UIManager()
+manager.add(background)
+
+# Standard game loop
+while not stop:
+    for event in manager.process_events():
+        if event.type == pygame.QUIT:
+            stop = True
+        elif event.type == pygame.MOUSEWHEEL:
+            # Scroll 30 pixels per wheel step
+            leaderboard.scroll_by(-event.y * 30)
+
+    # Drawing everything, only rows that came into view are drawn
+    manager.draw(surface)
+
+    pygame.display.flip()
+    clock.tick(60)
+
+pygame.quit()
@@ -1,5 +1,5 @@
 import pygame
-from UIComponents import Slider, Colors
+from UIComponents import Slider, Colors, UIManager
 
 # ---------- PYGAME SETUP ----------
 pygame.init()
@@ -16,42 +16,28 @@ def slide():
 slider1 = Slider((100, 100, 100, 5), 0, 100, 2, 50, Colors().red, Colors().black, 'My current value', font_size=20, click_function=slide)
 slider2 = Slider((100, 300, 200, 5), 10, 30, 0.1, 20, Colors().red, Colors().black, 'My current value', font_size=20, click_function=slide)
 
-button_down = False
+# Manager passes clicks to sliders and lets the pressed one capture the pointer until the button is released
+manager = UIManager()
+manager.add(slider1)
+manager.add(slider2)
 
 # Standard game loop
 while not stop:
-    # Standard event loop
-    for event in pygame.event.get():
+    events = pygame.event.get()
+
+    for event in events:
         if event.type == pygame.QUIT:
             stop = True
-        # User clicked mouse button (any)
-        elif event.type == pygame.MOUSEBUTTONDOWN:
-            # Keep track of if mouse button is still down
-            button_down = True
-            
-            # Checking if user has clicked the slider and running click_function
-            if slider1.clicked(pygame.mouse.get_pos()):
-                print('Clicked!')
-                 # Do whatever you want to do after user has pressed a slider
-                
-            elif slider2.clicked(pygame.mouse.get_pos()):
-                print('Clicked!')
-                 # Do whatever you want to do after user has pressed a slider
-
-        elif event.type == pygame.MOUSEBUTTONUP:
-            # Keep track of if mouse button is still down
-            button_down = False
-
-    # Check if user is slideing
-    if button_down:
-        slider1.clicked(pygame.mouse.get_pos())
-        slider2.clicked(pygame.mouse.get_pos())
+
+    # Clicks are passed to sliders under the pointer, mouse motion only to the dragged slider, once per frame
+    for obj in manager.handle_events(events):
+        print('Clicked!')
+        # Do whatever you want to do after user has pressed a slider
 
     surface.fill(Colors().white)
-    
-    # Drawing a slider
-    slider1.draw(surface)
-    slider2.draw(surface)
+
+    # Drawing sliders
+    manager.draw(surface)
 
     pygame.display.flip()
     clock.tick(30)